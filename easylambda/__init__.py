@@ -1,3 +1,18 @@
 from .main import delete, easylambda, get, options, patch, post, put
+from .router import Router
+from .sqs import sqs
+from .streams import dynamodb, kinesis
 
-__all__ = ["delete", "get", "easylambda", "options", "patch", "post", "put"]
+__all__ = [
+    "Router",
+    "delete",
+    "dynamodb",
+    "get",
+    "easylambda",
+    "kinesis",
+    "options",
+    "patch",
+    "post",
+    "put",
+    "sqs",
+]
@@ -0,0 +1,249 @@
+"""Adapters of the events of the different HTTP front doors of Lambda.
+
+Function URLs and HTTP APIs send the payload version 2.0 event, which `Event`
+models. The REST API and Application Load Balancers send other shapes, which
+their adapter normalizes into a version 2.0 event once per invocation, so
+dependencies read every event the same way. Each adapter also converts the
+response to the shape its front door expects.
+"""
+
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import unquote_plus, urlencode
+
+
+class EventAdapter(ABC):
+    """An adapter of the events of a front door."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def matches(self, event: dict[str, Any]) -> bool:
+        """Check whether an event comes from the front door of the adapter.
+
+        :param event: The raw event.
+        :returns: Whether the adapter handles the event.
+        """
+        raise NotImplementedError
+
+    def to_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Normalize an event into a payload version 2.0 event.
+
+        :param event: The raw event.
+        :returns: The payload version 2.0 event.
+        """
+        return event
+
+    def to_response(self, response: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+        """Convert a payload version 2.0 response to the front door's shape.
+
+        :param response: The payload version 2.0 response.
+        :param event: The raw event the response is for.
+        :returns: The response for the front door.
+        """
+        return response
+
+
+class HttpApiAdapter(EventAdapter):
+    """The payload version 2.0 events of Function URLs and HTTP APIs."""
+
+    __slots__ = ()
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        return event.get("version") == "2.0"
+
+
+class RestApiAdapter(EventAdapter):
+    """The payload version 1.0 events of REST APIs and HTTP APIs."""
+
+    __slots__ = ()
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        return "httpMethod" in event
+
+    def to_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        multi_value_headers = _lower_keys(event.get("multiValueHeaders"), event.get("headers"))
+        headers = _join_values(multi_value_headers)
+        query = event.get("multiValueQueryStringParameters") or {
+            name: [value] for name, value in (event.get("queryStringParameters") or {}).items()
+        }
+        context = event.get("requestContext") or {}
+        return _build_event(
+            event,
+            headers=headers,
+            multi_value_headers=multi_value_headers,
+            raw_query=urlencode([(k, v) for k, values in query.items() for v in values]),
+            query={name: ",".join(values) for name, values in query.items()},
+            route_key=f"{event['httpMethod']} {event.get('resource') or event['path']}",
+            context={
+                **context,
+                "http": {
+                    "method": event["httpMethod"],
+                    "path": event["path"],
+                    "protocol": context.get("protocol", "HTTP/1.1"),
+                    "sourceIp": (context.get("identity") or {}).get("sourceIp", ""),
+                    "userAgent": headers.get("user-agent", ""),
+                },
+            },
+        )
+
+    def to_response(self, response: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+        cookies = response.pop("cookies", None)
+        if cookies:
+            multi_value_headers = dict(response.get("multiValueHeaders") or {})
+            multi_value_headers["Set-Cookie"] = [
+                *multi_value_headers.get("Set-Cookie", ()),
+                *cookies,
+            ]
+            response["multiValueHeaders"] = multi_value_headers
+        return response
+
+
+class AlbAdapter(EventAdapter):
+    """The events of Application Load Balancers.
+
+    The query string parameters of these events are not URL-decoded, and the
+    response must use multiValueHeaders when the target group has multi-value
+    headers enabled, and headers otherwise.
+    """
+
+    __slots__ = ()
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        return "elb" in (event.get("requestContext") or {})
+
+    def to_event(self, event: dict[str, Any]) -> dict[str, Any]:
+        multi_value_headers = _lower_keys(event.get("multiValueHeaders"), event.get("headers"))
+        headers = _join_values(multi_value_headers)
+        query = event.get("multiValueQueryStringParameters") or {
+            name: [value] for name, value in (event.get("queryStringParameters") or {}).items()
+        }
+        decoded = {}
+        for name, values in query.items():
+            decoded.setdefault(unquote_plus(name), []).extend(map(unquote_plus, values))
+        return _build_event(
+            event,
+            headers=headers,
+            multi_value_headers=multi_value_headers,
+            raw_query="&".join(f"{k}={v}" for k, values in query.items() for v in values),
+            query={name: ",".join(values) for name, values in decoded.items()},
+            route_key="$default",
+            context={
+                **event["requestContext"],
+                "http": {
+                    "method": event["httpMethod"],
+                    "path": event["path"],
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": headers.get("x-forwarded-for", "").partition(",")[0].strip(),
+                    "userAgent": headers.get("user-agent", ""),
+                },
+            },
+        )
+
+    def to_response(self, response: dict[str, Any], event: dict[str, Any]) -> dict[str, Any]:
+        status = response["statusCode"]
+        try:
+            description = f"{status} {HTTPStatus(status).phrase}"
+        except ValueError:
+            description = str(status)
+
+        headers = response.get("headers") or {}
+        multi_value_headers = response.get("multiValueHeaders") or {}
+        cookies = response.get("cookies") or ()
+        result = {
+            "statusCode": status,
+            "statusDescription": description,
+            "isBase64Encoded": response.get("isBase64Encoded", False),
+            "body": response.get("body", ""),
+        }
+        if "multiValueHeaders" in event:
+            combined = {name: [value] for name, value in headers.items()}
+            for name, values in multi_value_headers.items():
+                combined.setdefault(name, []).extend(values)
+            if cookies:
+                combined.setdefault("Set-Cookie", []).extend(cookies)
+            result["multiValueHeaders"] = combined
+        else:
+            # Without multi-value headers, only the last value of a header is kept
+            result["headers"] = {
+                **{name: values[-1] for name, values in multi_value_headers.items() if values},
+                **headers,
+            }
+            if cookies:
+                result["headers"]["Set-Cookie"] = cookies[-1]
+        return result
+
+
+_http_api = HttpApiAdapter()
+
+# The adapters, in the order they are tried
+ADAPTERS: list[EventAdapter] = [_http_api, AlbAdapter(), RestApiAdapter()]
+
+
+def register_adapter(adapter: EventAdapter) -> None:
+    """Register the adapter of another front door, tried before the built-in ones.
+
+    :param adapter: The adapter.
+    """
+    ADAPTERS.insert(0, adapter)
+
+
+def detect(event: dict[str, Any]) -> EventAdapter:
+    """Find the adapter of an event.
+
+    Events of unknown shapes are handled as payload version 2.0 events.
+
+    :param event: The raw event.
+    :returns: The adapter.
+    """
+    for adapter in ADAPTERS:
+        if adapter.matches(event):
+            return adapter
+    return _http_api
+
+
+def _lower_keys(
+    multi_value_headers: dict[str, list[str]] | None,
+    headers: dict[str, str] | None,
+) -> dict[str, list[str]]:
+    lowered: dict[str, list[str]] = {}
+    if multi_value_headers:
+        for name, values in multi_value_headers.items():
+            lowered.setdefault(name.lower(), []).extend(values)
+    elif headers:
+        for name, value in headers.items():
+            lowered.setdefault(name.lower(), []).append(value)
+    return lowered
+
+
+def _join_values(headers: dict[str, list[str]]) -> dict[str, str]:
+    return {name: ",".join(values) for name, values in headers.items()}
+
+
+def _build_event(
+    event: dict[str, Any],
+    *,
+    headers: dict[str, str],
+    multi_value_headers: dict[str, list[str]],
+    raw_query: str,
+    query: dict[str, str],
+    route_key: str,
+    context: dict[str, Any],
+) -> dict[str, Any]:
+    cookie = headers.get("cookie")
+    return {
+        "version": "2.0",
+        "routeKey": route_key,
+        "rawPath": event["path"],
+        "rawQueryString": raw_query,
+        "cookies": [c.strip() for c in cookie.split(";") if c.strip()] if cookie else None,
+        "headers": headers,
+        "queryStringParameters": query or None,
+        "requestContext": context,
+        "body": event.get("body"),
+        "pathParameters": event.get("pathParameters"),
+        "isBase64Encoded": event.get("isBase64Encoded", False),
+        "stageVariables": event.get("stageVariables"),
+        "multiValueHeaders": multi_value_headers,
+    }
@@ -1,7 +1,24 @@
-from typing import Any
+import re
+from contextlib import AbstractContextManager, ExitStack
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import cached_property
+from threading import Lock
+from typing import Any, Callable, Hashable, Literal, Self, TypeVar
 from urllib.parse import parse_qs
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
+
+from easylambda.lazy import LazyModel
+
+T = TypeVar("T")
+
+# The characters allowed in cookie names, values and attributes (RFC 6265)
+_COOKIE_NAME = re.compile(r"[!#$%&'*+\-.^_`|~0-9A-Za-z]+")
+_COOKIE_VALUE = re.compile(
+    r'[\x21\x23-\x2b\x2d-\x3a\x3c-\x5b\x5d-\x7e]*|"[\x21\x23-\x2b\x2d-\x3a\x3c-\x5b\x5d-\x7e]*"'
+)
+_COOKIE_ATTRIBUTE = re.compile(r"[\x20-\x3a\x3c-\x7e]*")
 
 
 class Validity(BaseModel):
@@ -30,7 +47,7 @@ class Authorizer(BaseModel):
     jwt: Jwt
 
 
-class Http(BaseModel):
+class Http(LazyModel):
     method: str
     path: str
     protocol: str
@@ -38,7 +55,7 @@ class Http(BaseModel):
     userAgent: str
 
 
-class RequestContext(BaseModel):
+class RequestContext(LazyModel):
     accountId: str
     apiId: str
     authentication: Authentication | None = None
@@ -53,7 +70,89 @@ class RequestContext(BaseModel):
     timeEpoch: int
 
 
-class Event(BaseModel):
+# Guards the creation of the cache and the locks of events
+_event_lock = Lock()
+
+
+class EventModel(LazyModel):
+    """An event, or a record of a batch event, that dependencies are resolved for.
+
+    It holds the values dependencies compute for it, and the teardown of
+    generator dependencies, which runs when it is exited.
+    """
+
+    _exit_stack: ExitStack | None = None
+
+    @property
+    def cache(self) -> dict[Hashable, Any]:
+        """Values computed for this event, keyed by the dependency that computed them."""
+        try:
+            return self.__dict__["_cache"]
+        except KeyError:
+            # Parallel dependencies may be the first to use the cache
+            with _event_lock:
+                return self.__dict__.setdefault("_cache", {})
+
+    def lock(self, key: Hashable) -> Lock:
+        """Get the lock held while the value of a key of the cache is computed.
+
+        The locks are per event, so only the callers computing the same value
+        for the same event wait for each other.
+
+        :param key: The key of the cache, like the function of a dependency.
+        :returns: The lock.
+        """
+        with _event_lock:
+            locks = self.__dict__.setdefault("_locks", {})
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = Lock()
+            return lock
+
+    def enter_context(self, cm: AbstractContextManager[T]) -> T:
+        """Enter a context manager, to be exited when the event is done with.
+
+        :param cm: The context manager to enter.
+        :returns: The result of entering the context manager.
+        """
+        stack = self._exit_stack
+        if stack is None:
+            stack = self.__dict__["_exit_stack"] = ExitStack()
+        return stack.enter_context(cm)
+
+    def push(self, exit: Callable[..., bool | None]) -> None:
+        """Register an exit callback, to be called when the event is done with.
+
+        :param exit: The callback, called with the exception details like `__exit__`.
+        """
+        stack = self._exit_stack
+        if stack is None:
+            stack = self.__dict__["_exit_stack"] = ExitStack()
+        stack.push(exit)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        """Exit the context managers entered for this event, in reverse order.
+
+        The exception being handled is never suppressed, even when a
+        generator dependency catches it without re-raising.
+        """
+        stack = self._exit_stack
+        if stack is not None:
+            stack.__exit__(*exc_info)
+        return False
+
+
+class Event(EventModel):
+    """The HTTP API (payload version 2.0) event.
+
+    The event is a view over the raw payload: each field, including nested
+    objects like `requestContext.authentication`, is only validated when it is
+    first read.
+    """
+
     version: str
     routeKey: str
     rawPath: str
@@ -67,21 +166,215 @@ class Event(BaseModel):
     isBase64Encoded: bool
     stageVariables: dict[str, str] | None = None
     urlMatch: dict[str, str] = {}
+    # Not in payload version 2.0: the headers of front doors sending multi-value headers
+    multiValueHeaders: dict[str, list[str]] | None = None
+
+    @cached_property
+    def header_index(self) -> dict[str, list[str]]:
+        """The values of the headers, keyed by their lowercase name.
+
+        The index is built once per request, from the multi-value headers when
+        the front door sends them.
+        """
+        index: dict[str, list[str]] = {}
+        multi_value_headers = self.multiValueHeaders
+        if multi_value_headers:
+            for name, values in multi_value_headers.items():
+                index.setdefault(name.lower(), []).extend(values)
+        else:
+            for name, value in self.headers.items():
+                index.setdefault(name.lower(), []).append(value)
+        return index
+
+    def get_header(self, key: str) -> str | None:
+        """Get the value of a header, with the values of repeated headers comma-joined.
+
+        :param key: The lowercase name of the header.
+        :returns: The value, or None if the header is missing.
+        """
+        values = self.header_index.get(key)
+        if values is None:
+            return None
+        return values[0] if len(values) == 1 else ",".join(values)
+
+    def get_header_list(self, key: str) -> list[str]:
+        """Get the values of a header, splitting comma-joined values.
+
+        :param key: The lowercase name of the header.
+        :returns: The values, empty if the header is missing.
+        """
+        return [
+            item
+            for value in self.header_index.get(key, ())
+            for part in value.split(",")
+            if (item := part.strip())
+        ]
+
+    @cached_property
+    def cookie_map(self) -> dict[str, str]:
+        """The values of the request cookies, keyed by their name.
+
+        The map is built once per request, from the cookies of the event or
+        from the Cookie header. When a name is repeated, the first value, sent
+        for the most specific path, is kept.
+        """
+        cookies = self.cookies
+        if cookies is None:
+            header = self.get_header("cookie")
+            cookies = header.split(";") if header else ()
 
-    model_config = ConfigDict(frozen=True)
+        cookie_map: dict[str, str] = {}
+        for cookie in cookies:
+            name, separator, value = cookie.partition("=")
+            if not separator:
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            cookie_map.setdefault(name.strip(), value)
+        return cookie_map
 
-    _parse_qs_cache = None
-    _parse_qs_cache_valid = False
+    @cached_property
+    def _parsed_qs(self) -> dict[str, list[str]]:
+        return parse_qs(self.rawQueryString)
 
     def parse_qs(self) -> dict[str, list[str]]:
-        if self._parse_qs_cache_valid is False:
-            self._parse_qs_cache = parse_qs(self.rawQueryString)
-            self._parse_qs_cache_valid = True
-        return self._parse_qs_cache
+        return self._parsed_qs
+
+    @cached_property
+    def query_objects(self) -> dict[str, Any]:
+        """The query parameters in bracket notation, as nested objects.
+
+        Parameters like filter[status]=open are grouped into dicts, like
+        {"filter": {"status": "open"}}, and parameters like tag[]=a into lists.
+        """
+        objects: dict[str, Any] = {}
+        for key, values in self.parse_qs().items():
+            name, bracket, rest = key.partition("[")
+            if not bracket or not rest.endswith("]"):
+                continue
+
+            keys = [name, *rest[:-1].split("][")]
+            if keys[-1] == "":
+                keys.pop()
+                value = values
+            else:
+                value = values[-1]
+
+            node = objects
+            for part in keys[:-1]:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = {}
+                node = child
+            node[keys[-1]] = value
+        return objects
+
+    def get_query(self, key: str) -> Any:
+        """Get the value of a query parameter.
+
+        Values are read from queryStringParameters, as parsed by the front
+        door. The query string is only parsed for repeated parameters, whose
+        values the front door comma-joins, for values with a "+", which some
+        front doors leave as is instead of decoding it as a space, and for
+        parameters in bracket notation.
+
+        :param key: The name of the parameter.
+        :returns: The last value of the parameter, a dict for parameters in
+            bracket notation, or None if the parameter is missing.
+        """
+        params = self.queryStringParameters
+        if params is not None:
+            value = params.get(key)
+            if value and "," not in value and "+" not in value:
+                return value
+
+        values = self.parse_qs().get(key)
+        if values:
+            return values[-1]
+        if "[" not in self.rawQueryString and "%5B" not in self.rawQueryString.upper():
+            return None
+        return self.query_objects.get(key)
+
+    def get_query_list(self, key: str) -> list[Any]:
+        """Get the values of a repeated query parameter.
+
+        :param key: The name of the parameter, without brackets for parameters
+            like tag[]=a&tag[]=b.
+        :returns: The values, empty if the parameter is missing.
+        """
+        values = self.parse_qs().get(key)
+        if values is not None:
+            return values
+        values = self.parse_qs().get(f"{key}[]")
+        return [] if values is None else values
 
     @property
     def content_type(self) -> str | None:
-        return self.headers.get("content-type", None)
+        return self.get_header("content-type")
+
+
+class SqsRecord(EventModel):
+    """A message of an SQS event."""
+
+    messageId: str
+    receiptHandle: str
+    body: str
+    attributes: dict[str, str] = {}
+    messageAttributes: dict[str, dict[str, Any]] = {}
+    md5OfBody: str | None = None
+    eventSource: str | None = None
+    eventSourceARN: str | None = None
+    awsRegion: str | None = None
+
+
+class KinesisData(LazyModel):
+    kinesisSchemaVersion: str | None = None
+    partitionKey: str
+    sequenceNumber: str
+    data: str
+    approximateArrivalTimestamp: float | None = None
+
+
+class KinesisRecord(EventModel):
+    """A record of a Kinesis Data Streams event."""
+
+    kinesis: KinesisData
+    eventSource: str | None = None
+    eventVersion: str | None = None
+    eventID: str | None = None
+    eventName: str | None = None
+    invokeIdentityArn: str | None = None
+    awsRegion: str | None = None
+    eventSourceARN: str | None = None
+
+
+class DynamoDBStreamRecord(LazyModel):
+    ApproximateCreationDateTime: float | None = None
+    Keys: dict[str, Any] = {}
+    NewImage: dict[str, Any] | None = None
+    OldImage: dict[str, Any] | None = None
+    SequenceNumber: str
+    SizeBytes: int | None = None
+    StreamViewType: str | None = None
+
+
+class DynamoDBRecord(EventModel):
+    """A record of a DynamoDB Streams event."""
+
+    dynamodb: DynamoDBStreamRecord
+    eventID: str | None = None
+    eventName: str | None = None
+    eventVersion: str | None = None
+    eventSource: str | None = None
+    awsRegion: str | None = None
+    eventSourceARN: str | None = None
+
+
+class StreamBatch(EventModel):
+    """A batch of records of a Kinesis or DynamoDB Streams event."""
+
+    Records: list[dict[str, Any]]
 
 
 class Response(BaseModel):
@@ -90,3 +383,60 @@ class Response(BaseModel):
     isBase64Encoded: bool = False
     multiValueHeaders: dict[str, list[str]] = {}
     body: str = ""
+    cookies: list[str] = []
+
+    def set_cookie(
+        self,
+        name: str,
+        value: str,
+        *,
+        max_age: int | None = None,
+        expires: datetime | None = None,
+        path: str | None = "/",
+        domain: str | None = None,
+        secure: bool = True,
+        httponly: bool = True,
+        samesite: Literal["Strict", "Lax", "None"] | None = "Lax",
+    ) -> None:
+        """Add a cookie to set, sent in the cookies of the response.
+
+        Front doors without a cookies field, like the REST API, get the
+        cookies as Set-Cookie multiValueHeaders.
+
+        :param name: The name of the cookie.
+        :param value: The value of the cookie.
+        :param max_age: The number of seconds until the cookie expires.
+        :param expires: When the cookie expires.
+        :param path: The path the cookie is sent for.
+        :param domain: The domain the cookie is sent to.
+        :param secure: Whether the cookie is only sent over HTTPS.
+        :param httponly: Whether the cookie is hidden from scripts.
+        :param samesite: Whether the cookie is sent with cross-site requests.
+        :raises ValueError: If the name, value, path or domain have characters
+            not allowed in cookies, like ";" or whitespace.
+        """
+        if _COOKIE_NAME.fullmatch(name) is None:
+            raise ValueError(f"Invalid cookie name {name!r}.")
+        if _COOKIE_VALUE.fullmatch(value) is None:
+            raise ValueError(f"Invalid value for cookie {name!r}.")
+        for attribute in (path, domain):
+            if attribute is not None and _COOKIE_ATTRIBUTE.fullmatch(attribute) is None:
+                raise ValueError(f"Invalid attribute {attribute!r} for cookie {name!r}.")
+
+        attributes = [f"{name}={value}"]
+        if max_age is not None:
+            attributes.append(f"Max-Age={max_age}")
+        if expires is not None:
+            expires = expires.astimezone(timezone.utc)
+            attributes.append(f"Expires={format_datetime(expires, usegmt=True)}")
+        if path is not None:
+            attributes.append(f"Path={path}")
+        if domain is not None:
+            attributes.append(f"Domain={domain}")
+        if secure:
+            attributes.append("Secure")
+        if httponly:
+            attributes.append("HttpOnly")
+        if samesite is not None:
+            attributes.append(f"SameSite={samesite}")
+        self.cookies.append("; ".join(attributes))
@@ -1,32 +1,146 @@
-import json
 from base64 import b64decode
 from typing import Any, Match
+from zlib import error as ZlibError
 
 from easylambda.aws import Event
+from easylambda.compression import DECODINGS, decompress
 from easylambda.dependency import Dependency
+from easylambda.encoders import get_encoder
+from easylambda.errors import (
+    HttpBadRequest,
+    HttpPayloadTooLarge,
+    HttpUnsupportedMediaType,
+)
 
-_Undefined = object()
+# The default maximum size of a decompressed request body, in bytes
+MAX_DECOMPRESSED_SIZE = 16 * 2**20
+
+# Media types, besides text/*, whose bodies are read as text
+TEXT_MEDIA_TYPES = frozenset(
+    (
+        "application/javascript",
+        "application/x-www-form-urlencoded",
+        "application/xml",
+    )
+)
 
 
 class Body(Dependency):
-    _cache = _Undefined
-    _cache_request_id = _Undefined
+    __slots__ = ("max_size",)
+
+    def __init__(self, *, max_size: int | None = None) -> None:
+        """Initialize the dependency.
+
+        :param max_size: The maximum size of the body once decompressed, in
+            bytes. Defaults to `MAX_DECOMPRESSED_SIZE`.
+        """
+        self.max_size = max_size
 
     def __call__(self, event: Event, route: Match) -> Any:
-        request_id = event.requestContext.requestId
-        if event.isBase64Encoded:
-            body = b64decode(event.body).decode()
+        # The body is parsed once per request, for all Body parameters
+        try:
+            return event.cache[Body]
+        except KeyError:
+            pass
+
+        if event.body is None:
+            # Requests without a body have no value to decode
+            event.cache[Body] = None
+            return None
+
+        body = read_body(event, self.max_size)
+        media_type = (event.content_type or "").partition(";")[0].strip().lower()
+        encoder = get_encoder(media_type)
+        if encoder is not None:
+            try:
+                value = encoder.loads(body)
+            except ValueError:
+                value = None
+        elif not media_type or is_text(media_type):
+            try:
+                value = body.decode()
+            except UnicodeDecodeError:
+                raise HttpBadRequest("Request body is not valid UTF-8.") from None
         else:
-            body = event.body
-        if self._cache_request_id != request_id:
-            match event.content_type:
-                case "application/json":
-                    self._cache_request_id = request_id
-                    try:
-                        self._cache = json.loads(body)
-                    except json.JSONDecodeError:
-                        self._cache = None
-                case _:
-                    self._cache_request_id = request_id
-                    self._cache = body
-        return self._cache
+            # Binary bodies, like images or protobuf, are never forced through text
+            value = body
+        event.cache[Body] = value
+        return value
+
+
+class RawBody(Dependency):
+    """The request body as bytes, whatever its content type."""
+
+    __slots__ = ("max_size", "view")
+
+    def __init__(self, *, max_size: int | None = None, view: bool = False) -> None:
+        """Initialize the dependency.
+
+        :param max_size: The maximum size of the body once decompressed, in
+            bytes. Defaults to `MAX_DECOMPRESSED_SIZE`.
+        :param view: Whether to return a memoryview of the body, which can be
+            sliced without copies, instead of bytes.
+        """
+        self.max_size = max_size
+        self.view = view
+
+    def __call__(self, event: Event, route: Match) -> bytes | memoryview:
+        body = read_body(event, self.max_size)
+        return memoryview(body) if self.view else body
+
+
+def is_text(media_type: str) -> bool:
+    """Check whether a media type is read as text.
+
+    :param media_type: The media type, in lowercase and without parameters.
+    :returns: Whether bodies of the media type are text.
+    """
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+xml")
+        or media_type in TEXT_MEDIA_TYPES
+    )
+
+
+def read_body(event: Event, max_size: int | None = None) -> bytes:
+    """Read the request body as bytes.
+
+    The body is base64-decoded and decompressed once per request, and shared by
+    all the dependencies that read it.
+
+    :param event: The event.
+    :param max_size: The maximum size of the body once decompressed, in bytes.
+        Defaults to `MAX_DECOMPRESSED_SIZE`.
+    :returns: The body.
+    :raises HttpPayloadTooLarge: If the decompressed body exceeds the maximum size.
+    :raises HttpBadRequest: If the body is not valid for its content encoding.
+    :raises HttpUnsupportedMediaType: If the body has an unsupported content encoding.
+    """
+    if max_size is None:
+        max_size = MAX_DECOMPRESSED_SIZE
+
+    try:
+        body = event.cache[read_body]
+    except KeyError:
+        # Binary bodies are only base64-decoded, never decoded as text
+        if event.body is None:
+            body = b""
+        elif event.isBase64Encoded:
+            body = b64decode(event.body)
+        else:
+            body = event.body.encode()
+        encoding = (event.get_header("content-encoding") or "identity").strip().lower()
+        if encoding in DECODINGS:
+            try:
+                body = decompress(body, encoding, max_size)
+            except OverflowError:
+                raise HttpPayloadTooLarge() from None
+            except ZlibError:
+                raise HttpBadRequest(f"Invalid {encoding} request body.") from None
+        elif encoding != "identity":
+            raise HttpUnsupportedMediaType(f"Unsupported content encoding {encoding!r}.")
+        event.cache[read_body] = body
+
+    if len(body) > max_size:
+        raise HttpPayloadTooLarge()
+    return body
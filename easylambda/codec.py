@@ -0,0 +1,93 @@
+"""The JSON backend used to parse request bodies and encode responses.
+
+The fastest installed backend is used: orjson, then msgspec, falling back to
+the standard library. The backend can be forced with the EASYLAMBDA_JSON
+environment variable or with `use_backend`.
+"""
+
+import json
+from os import environ
+from typing import Any, Callable, Literal
+
+Backend = Literal["orjson", "msgspec", "json"]
+
+backend: Backend
+_loads: Callable[[str | bytes], Any]
+_dumps: Callable[[Any], str]
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document.
+
+    :param data: The JSON document.
+    :returns: The parsed value.
+    :raises ValueError: If the document is not valid JSON.
+    """
+    return _loads(data)
+
+
+def dumps(value: Any) -> str:
+    """Encode a value as a JSON document.
+
+    :param value: The value to encode.
+    :returns: The JSON document.
+    :raises TypeError: If the value cannot be encoded.
+    """
+    return _dumps(value)
+
+
+def use_backend(name: Backend) -> None:
+    """Set the JSON backend.
+
+    :param name: The backend, which must be installed.
+    """
+    global backend, _loads, _dumps
+    match name:
+        case "orjson":
+            import orjson
+
+            def _dumps(value: Any) -> str:
+                return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+            _loads = orjson.loads
+        case "msgspec":
+            import msgspec
+
+            encoder = msgspec.json.Encoder()
+            decoder = msgspec.json.Decoder()
+
+            def _loads(data: str | bytes) -> Any:
+                try:
+                    return decoder.decode(data)
+                except msgspec.DecodeError as e:
+                    raise ValueError(str(e)) from None
+
+            def _dumps(value: Any) -> str:
+                try:
+                    return encoder.encode(value).decode()
+                except msgspec.EncodeError as e:
+                    raise TypeError(str(e)) from None
+
+        case "json":
+            _loads = json.loads
+            _dumps = json.dumps
+        case _:
+            raise ValueError(f"Unknown JSON backend {name!r}.")
+    backend = name
+
+
+def _use_default_backend() -> None:
+    if "EASYLAMBDA_JSON" in environ:
+        use_backend(environ["EASYLAMBDA_JSON"])
+        return
+
+    for name in ("orjson", "msgspec"):
+        try:
+            use_backend(name)
+        except ImportError:
+            continue
+        return
+    use_backend("json")
+
+
+_use_default_backend()
@@ -0,0 +1,147 @@
+"""Compression of response bodies, and decompression of request bodies.
+
+Response bodies of at least the compression threshold are compressed with
+brotli, when installed and accepted by the client, or with gzip. Compressed
+bodies are base64-encoded, as Lambda requires for binary bodies.
+
+Request bodies encoded with gzip or deflate are decompressed up to a maximum
+size, so a small compressed body cannot exhaust the memory of the function.
+"""
+
+import zlib
+from base64 import b64encode
+from functools import lru_cache
+from typing import Any
+
+from easylambda.aws import Event
+from easylambda.header import Header
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# The encodings supported, by order of preference
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# The encodings of request bodies that can be decompressed, with their zlib window bits
+DECODINGS = {"gzip": 16 + zlib.MAX_WBITS, "x-gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+# Statuses whose responses have no body to compress
+_NO_BODY_STATUSES = frozenset((204, 304))
+
+_accept_encoding = Header("Accept-Encoding")
+
+
+@lru_cache(maxsize=64)
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Choose the encoding of a response from an Accept-Encoding header.
+
+    :param accept_encoding: The value of the Accept-Encoding header.
+    :returns: The preferred supported encoding accepted by the client, or None
+        if the client accepts none of them.
+    """
+    weights, default = {}, None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding == "*":
+            default = weight
+        elif coding:
+            weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, default or 0.0)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with an encoding.
+
+    The compression levels favor speed, since Lambda bills for the time spent.
+
+    :param data: The data to compress.
+    :param encoding: The encoding, one of `ENCODINGS`.
+    :returns: The compressed data.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=4)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_response(response: dict[str, Any], event: Event, threshold: int) -> dict[str, Any]:
+    """Compress the body of a response, if the client accepts it.
+
+    Responses that are already encoded, base64-encoded, bodiless or smaller than
+    the threshold are left as they are.
+
+    :param response: The Lambda response, modified in place.
+    :param event: The event the response is for.
+    :param threshold: The minimum size of the body to compress, in bytes.
+    :returns: The response.
+    """
+    body = response.get("body")
+    if not body or response.get("isBase64Encoded") or response["statusCode"] in _NO_BODY_STATUSES:
+        return response
+
+    headers = response.get("headers") or {}
+    if any(name.lower() == "content-encoding" for name in headers):
+        return response
+
+    try:
+        encoding = choose_encoding(_accept_encoding(event, None))
+    except KeyError:
+        return response
+    if encoding is None:
+        return response
+
+    data = body.encode()
+    if len(data) < threshold:
+        return response
+
+    response["headers"] = {**headers, "Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    response["body"] = b64encode(compress(data, encoding)).decode()
+    response["isBase64Encoded"] = True
+    return response
+
+
+def decompress(data: bytes, encoding: str, max_size: int) -> bytes:
+    """Decompress data encoded with gzip or deflate.
+
+    :param data: The compressed data.
+    :param encoding: The encoding, one of `DECODINGS`.
+    :param max_size: The maximum size of the decompressed data, in bytes.
+    :returns: The decompressed data.
+    :raises OverflowError: If the decompressed data exceeds the maximum size.
+    :raises zlib.error: If the data is not valid for the encoding.
+    """
+    wbits = DECODINGS[encoding]
+    try:
+        return _decompress(data, wbits, max_size)
+    except zlib.error:
+        if encoding != "deflate":
+            raise
+    # Some clients send deflate bodies without the zlib header
+    return _decompress(data, -zlib.MAX_WBITS, max_size)
+
+
+def _decompress(data: bytes, wbits: int, max_size: int) -> bytes:
+    decompressor = zlib.decompressobj(wbits)
+    result = decompressor.decompress(data, max_size + 1)
+    if len(result) > max_size:
+        raise OverflowError(f"Decompressed data exceeds {max_size} bytes.")
+    if not decompressor.eof:
+        raise zlib.error("Incomplete compressed data.")
+    return result
@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock, local
+from typing import Any, Callable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = Lock()
+_thread_state = local()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop of the Lambda container, creating it on first use.
+
+    The loop is reused across invocations, so connections and other resources
+    bound to it survive between warm invocations.
+
+    :returns: The event loop.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the event loop of the Lambda container.
+
+    :param coroutine: The coroutine to run.
+    :returns: The result of the coroutine.
+    """
+    return get_event_loop().run_until_complete(coroutine)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool of the Lambda container, creating it on first use.
+
+    :returns: The thread pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                thread_name_prefix="easylambda",
+                initializer=_mark_worker_thread,
+            )
+    return _executor
+
+
+def submit(func: Callable[..., T], /, *args: Any) -> Future[T]:
+    """Run a function on the thread pool of the Lambda container.
+
+    On a thread of the pool, the function runs inline instead: a task waiting
+    for the tasks it submitted could otherwise exhaust the pool.
+
+    :param func: The function to run.
+    :param args: The arguments to call the function with.
+    :returns: The future of the function's result.
+    """
+    if not getattr(_thread_state, "is_worker", False):
+        return get_executor().submit(func, *args)
+
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _mark_worker_thread() -> None:
+    _thread_state.is_worker = True
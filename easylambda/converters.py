@@ -0,0 +1,109 @@
+"""Converters of typed path parameters, like `{item_id:int}`.
+
+A converter restricts what a path segment matches, so requests with values
+of the wrong type do not match the route, and converts the matched value, so
+`Path` returns it already typed.
+"""
+
+import re
+from typing import Any, Callable
+from uuid import UUID
+
+
+class Converter:
+    """A converter of path parameters."""
+
+    __slots__ = ("regex", "pattern", "convert")
+
+    def __init__(self, regex: str, convert: Callable[[str], Any]) -> None:
+        """Initialize the converter.
+
+        :param regex: The regular expression of the values the parameter matches.
+        :param convert: Converts a matched value.
+        """
+        self.regex = regex
+        self.pattern = re.compile(regex)
+        self.convert = convert
+
+    def match(self, value: str) -> Any:
+        """Match and convert a value.
+
+        :param value: The value, like a path segment.
+        :returns: The converted value.
+        :raises ValueError: If the value does not match.
+        """
+        if self.pattern.fullmatch(value) is None:
+            raise ValueError(f"{value!r} does not match {self.regex!r}.")
+        return self.convert(value)
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+CONVERTERS: dict[str, Converter] = {
+    "str": Converter(r"[^/]+", _identity),
+    "int": Converter(r"[0-9]+", int),
+    "uuid": Converter(
+        r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}", UUID
+    ),
+    "path": Converter(r".+", _identity),
+}
+
+# Matches a parameter of a route, like {name} or {name:type}
+PARAM_REGEX = re.compile(r"{([^}:]+)(?::([^}]+))?}")
+
+
+def get_converter(name: str | None) -> Converter:
+    """Get a converter by the name used in routes.
+
+    :param name: The name of the converter, or None for `str`.
+    :returns: The converter.
+    :raises ValueError: If there is no converter with the name.
+    """
+    try:
+        return CONVERTERS["str" if name is None else name]
+    except KeyError:
+        raise ValueError(f"Unknown path converter {name!r}.") from None
+
+
+def compile_route(route: str) -> tuple[re.Pattern[str], dict[str, Converter]]:
+    """Compile a route into a regular expression.
+
+    The text between parameters is kept as regular expression syntax, so
+    routes like "/.*" match any path.
+
+    :param route: The route, with parameters like {name} or {name:type}.
+    :returns: The regular expression, and the converters of the parameters
+        that are not strings.
+    """
+    converters = {}
+    parts = []
+    position = 0
+    for param in PARAM_REGEX.finditer(route):
+        name, converter = param.group(1), get_converter(param.group(2))
+        if converter.convert is not _identity:
+            converters[name] = converter
+        parts.append(route[position : param.start()])
+        parts.append(f"(?P<{name}>{converter.regex})")
+        position = param.end()
+    parts.append(route[position:])
+    return re.compile("^" + "".join(parts) + "$"), converters
+
+
+class RouteMatch:
+    """The path parameters captured by a route, exposed like a `re.Match`."""
+
+    __slots__ = ("params",)
+
+    def __init__(self, params: dict[str, Any]) -> None:
+        self.params = params
+
+    def group(self, name: str) -> Any:
+        try:
+            return self.params[name]
+        except KeyError:
+            raise IndexError("no such group") from None
+
+    def groupdict(self) -> dict[str, Any]:
+        return self.params
@@ -0,0 +1,15 @@
+from typing import Match
+
+from easylambda.aws import Event
+from easylambda.dependency import Dependency
+
+
+class Cookie(Dependency):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, event: Event, route: Match) -> str:
+        try:
+            return event.cookie_map[self.name]
+        except KeyError:
+            raise KeyError(self.name) from None
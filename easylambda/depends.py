@@ -1,36 +1,141 @@
-from inspect import Signature, isclass, signature
-from typing import Annotated, Any, Callable, Match, TypeVar, get_args, get_origin
+import asyncio
+from concurrent.futures import wait
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from inspect import (
+    Signature,
+    isasyncgenfunction,
+    isclass,
+    iscoroutinefunction,
+    isgeneratorfunction,
+    signature,
+)
+from threading import Lock
+from time import monotonic
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    Match,
+    TypeVar,
+    get_args,
+    get_origin,
+)
 
-from easylambda.aws import Event
+from pydantic import ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+
+from easylambda.aws import Event, EventModel
+from easylambda.concurrency import run, submit
 from easylambda.dependency import Dependency
+from easylambda.header import Header
+from easylambda.path import Path
+from easylambda.query import Query
 
 T = TypeVar("T")
 
 
+# Ways of resolving a parameter in a Depends execution plan
+_EVENT, _VALUE, _DEPENDENCY, _PATH, _HEADER, _QUERY, _QUERY_LIST, _HEADER_LIST = range(8)
+
+_Required = object()
+_Unset = object()
+
+
+class _ContainerValue:
+    """The container-scoped result of a function, shared by all its Depends."""
+
+    __slots__ = ("lock", "value", "expires_at", "exit_stack", "stale_stacks")
+
+    def __init__(self, is_async: bool) -> None:
+        self.lock = Lock()
+        self.value: Any = _Unset
+        self.expires_at = 0.0
+        # The teardown of async values is awaited on the event loop
+        self.exit_stack: ExitStack | AsyncExitStack = AsyncExitStack() if is_async else ExitStack()
+        # Async teardowns left by invalidate() on the event loop, awaited by the next call
+        self.stale_stacks: list[AsyncExitStack] = []
+
+
+# The container-scoped results, keyed by function
+_container_values: dict[Callable[..., Any], _ContainerValue] = {}
+
+
 class Depends(Dependency):
     """Dependency injection class."""
 
-    def __init__(self, func: Callable[..., T]) -> None:
+    def __init__(
+        self,
+        func: Callable[..., T],
+        *,
+        use_cache: bool = True,
+        scope: Literal["request", "container"] = "request",
+        ttl: float | None = None,
+        parallel: bool = False,
+        validate: bool = False,
+    ) -> None:
         """Initialize the dependency injection class.
 
-        :param func: The function to inject the dependencies.
+        The function's parameters are compiled into an execution plan: one
+        entry per parameter, with the way to resolve it and its default value.
+        Path, Header and Query parameters are read from the event directly.
+
+        :param func: The function to inject the dependencies. If it is a
+            generator function, the value it yields is injected, and the code
+            after the yield runs once the response is built. It may also be a
+            coroutine function or an async generator function, in which case
+            its async dependencies are resolved concurrently.
+        :param use_cache: Whether to call the function once per request, sharing
+            its result with every other Depends of the same function.
+        :param scope: How long the result lives. With "container", the function
+            is called on first use and its result is reused by the following
+            invocations of the Lambda container, and by every Depends of the
+            same function, so it should not depend on the request.
+        :param ttl: With the "container" scope, the number of seconds after
+            which the function is called again.
+        :param parallel: Whether the function is safe to run on another thread.
+            Parallel dependencies of a function are started on the thread pool
+            of the container before its other dependencies are resolved, so
+            blocking calls overlap. Their own dependencies are resolved on the
+            same thread, before they are called.
+        :param validate: Whether to validate the arguments of the function
+            against its annotations, all at once with a TypedDict built from its
+            signature.
         """
+        if scope not in ("request", "container"):
+            raise ValueError(f"Invalid scope {scope!r} for {func}.")
+        if ttl is not None and scope != "container":
+            raise ValueError(f"A ttl requires the container scope for {func}.")
+        if parallel and (iscoroutinefunction(func) or isasyncgenfunction(func)):
+            raise ValueError(f"Async function {func} cannot run on another thread.")
+
         self.func = func
-        func_kwargs: dict[str, Callable[[Event, Match], Any]] = {}
-        self.func_kwargs = func_kwargs
+        self.is_coroutine = iscoroutinefunction(func)
+        self.context_manager = contextmanager(func) if isgeneratorfunction(func) else None
+        self.async_context_manager = asynccontextmanager(func) if isasyncgenfunction(func) else None
+        self.use_cache = use_cache
+        self.scope = scope
+        self.ttl = ttl
+        self.parallel = parallel
+        plan: list[tuple[str, int, Any, Any]] = []
+        self.plan = plan
+        async_plan: list[tuple[str, Depends, Any]] = []
+        self.async_plan = async_plan
+        parallel_plan: list[tuple[str, Depends, Any]] = []
+        self.parallel_plan = parallel_plan
         for k, p in signature(func).parameters.items():
             v = p.annotation
+            default = _Required if p.default is Signature.empty else p.default
 
-            if v is Event:
-                # expected type is Event
-                func_kwargs[k] = lambda event, match: event
+            if isclass(v) and issubclass(v, EventModel):
+                # expected type is the event, or the record of a batch event
+                plan.append((k, _EVENT, None, default))
                 continue
 
-            has_default = p.default is not Signature.empty
             is_annotated = get_origin(v) is Annotated
             if not is_annotated:
                 # argument is not annotated
-                if not has_default:
+                if default is _Required:
                     # argument is not annotated and has no default value
                     raise ValueError(
                         f"Parameter {k} of {func} must be annotated with "
@@ -38,24 +143,25 @@ class Depends(Dependency):
                     )
 
                 # argument is not annotated but has a default value
-                func_kwargs[k] = lambda event, match: p.default
+                plan.append((k, _VALUE, None, default))
                 continue
 
             # if is annotated
             for m in get_args(v):
-                if isinstance(m, Dependency):
-                    # argument is a dependency
-                    if has_default:
-                        func_kwargs[k] = try_except(m, KeyError, p.default)
-                    else:
-                        func_kwargs[k] = m
-                    break
-                elif isclass(m) and issubclass(m, Dependency):
+                if isclass(m) and issubclass(m, Dependency):
                     # argument is a Dependency, but not instantiated
-                    if has_default:
-                        func_kwargs[k] = try_except(m(), KeyError, p.default)
-                    else:
-                        func_kwargs[k] = m()
+                    m = m()
+                if isinstance(m, Depends) and m.is_async:
+                    # argument is an async dependency, resolved concurrently
+                    async_plan.append((k, m, default))
+                    break
+                elif isinstance(m, Depends) and m.parallel:
+                    # argument is a blocking dependency, resolved on another thread
+                    parallel_plan.append((k, m, default))
+                    break
+                elif isinstance(m, Dependency):
+                    # argument is a dependency
+                    plan.append((k, *compile_dependency(m), default))
                     break
             else:
                 # argument is annotated but not with Depends
@@ -64,37 +170,323 @@ class Depends(Dependency):
                     f"Depends to use it as a dependency."
                 )
 
+        self.arguments_adapter = None
+        if validate:
+            func_signature = signature(func)
+            arguments = TypedDict(
+                f"{getattr(func, '__name__', type(func).__name__)}_arguments",
+                {
+                    k: Any if p.annotation is Signature.empty else p.annotation
+                    for k, p in func_signature.parameters.items()
+                },
+            )
+            # Every key is required: arguments with defaults are always set, and
+            # missing required arguments are reported as missing.
+            # Arguments of types unknown to pydantic, like memoryview, are checked by isinstance
+            arguments.__pydantic_config__ = ConfigDict(arbitrary_types_allowed=True)
+            self.arguments_adapter = TypeAdapter(arguments)
+
+        self.is_async = bool(
+            async_plan or self.is_coroutine or self.async_context_manager is not None
+        )
+        self.container = None
+        if scope == "container":
+            self.container = _container_values.setdefault(func, _ContainerValue(self.is_async))
+
     def __call__(self, event: Event, match: Match) -> T:
+        """Call the function with the dependencies, or reuse its result for the request.
+
+        :param event: The event to inject into the dependencies.
+        :param match: The route match to inject into the dependencies.
+        :returns: The result of the function.
+        """
+        if self.is_async:
+            return run(self.call_async(event, match))
+
+        container = self.container
+        if container is not None:
+            with container.lock:
+                expired = self.ttl is not None and monotonic() >= container.expires_at
+                if container.value is _Unset or expired:
+                    container.exit_stack.close()
+                    container.value = self.solve(event, match, container.exit_stack)
+                    if self.ttl is not None:
+                        container.expires_at = monotonic() + self.ttl
+                return container.value
+
+        if not self.use_cache:
+            return self.solve(event, match)
+
+        # The lock keeps parallel dependencies from solving the function twice for the event
+        with event.lock(self.func):
+            try:
+                return event.cache[self.func]
+            except KeyError:
+                pass
+            result = event.cache[self.func] = self.solve(event, match)
+            return result
+
+    async def call_async(self, event: Event, match: Match) -> T:
+        """Call the function with the dependencies on the running event loop.
+
+        Concurrent callers share one task, so the function still runs once
+        per request, or once per container with the "container" scope.
+
+        :param event: The event to inject into the dependencies.
+        :param match: The route match to inject into the dependencies.
+        :returns: The result of the function.
+        """
+        container = self.container
+        if container is not None:
+            expired = self.ttl is not None and monotonic() >= container.expires_at
+            if container.value is _Unset or expired:
+                stale = [*container.stale_stacks, container.exit_stack]
+                container.stale_stacks = []
+                container.exit_stack = AsyncExitStack()
+                refreshed = self.refresh_async(event, match, stale, container.exit_stack)
+                container.value = asyncio.ensure_future(refreshed)
+                if self.ttl is not None:
+                    container.expires_at = monotonic() + self.ttl
+            task = container.value
+            try:
+                return await task
+            except BaseException:
+                # Failures are not reused by the following invocations
+                if container.value is task:
+                    container.value = _Unset
+                raise
+
+        if not self.use_cache:
+            return await self.solve_async(event, match)
+
+        try:
+            task = event.cache[self.func]
+        except KeyError:
+            solved = self.solve_async(event, match)
+            task = event.cache[self.func] = asyncio.ensure_future(solved)
+        return await task
+
+    async def refresh_async(
+        self,
+        event: Event,
+        match: Match,
+        stale: list[AsyncExitStack],
+        exit_stack: AsyncExitStack,
+    ) -> T:
+        """Tear down the previous container-scoped results, and compute the new one.
+
+        :param event: The event to inject into the dependencies.
+        :param match: The route match to inject into the dependencies.
+        :param stale: The exit stacks of the previous results.
+        :param exit_stack: Where to enter the new result.
+        :returns: The result of the function.
+        """
+        for stack in stale:
+            await stack.aclose()
+        return await self.solve_async(event, match, exit_stack)
+
+    def invalidate(self) -> None:
+        """Discard the container-scoped result, so the next call computes it again."""
+        container = self.container
+        if container is None:
+            return
+
+        with container.lock:
+            container.value = _Unset
+            if isinstance(container.exit_stack, ExitStack):
+                container.exit_stack.close()
+                return
+
+            stack, container.exit_stack = container.exit_stack, AsyncExitStack()
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                run(stack.aclose())
+            else:
+                # The event loop cannot be re-entered, the next call awaits the teardown
+                container.stale_stacks.append(stack)
+
+    def resolve(self, event: Event, match: Match) -> dict[str, Any]:
+        """Resolve the synchronous dependencies of the function.
+
+        :param event: The event to inject into the dependencies.
+        :param match: The route match to inject into the dependencies.
+        :returns: The keyword arguments for the function.
+        """
+        kwargs = {}
+        for name, how, source, default in self.plan:
+            try:
+                if how == _DEPENDENCY:
+                    kwargs[name] = source(event, match)
+                elif how == _QUERY:
+                    value = event.get_query(source)
+                    if value is None:
+                        raise KeyError(source)
+                    kwargs[name] = value
+                elif how == _HEADER:
+                    value = event.get_header(source)
+                    if value is None:
+                        raise KeyError(source)
+                    kwargs[name] = value
+                elif how == _PATH:
+                    try:
+                        kwargs[name] = match.group(source)
+                    except IndexError:
+                        raise KeyError(source) from None
+                elif how == _QUERY_LIST:
+                    kwargs[name] = event.get_query_list(source)
+                elif how == _HEADER_LIST:
+                    kwargs[name] = event.get_header_list(source)
+                elif how == _EVENT:
+                    kwargs[name] = event
+                else:
+                    kwargs[name] = default
+            except KeyError:
+                if default is not _Required:
+                    kwargs[name] = default
+                elif self.arguments_adapter is None:
+                    raise
+                # Otherwise the validation reports the missing argument, with the others
+        return kwargs
+
+    def solve(
+        self,
+        event: Event,
+        match: Match,
+        exit_stack: ExitStack | Event | None = None,
+    ) -> T:
         """Call the function with the dependencies.
 
         :param event: The event to inject into the dependencies.
         :param match: The route match to inject into the dependencies.
+        :param exit_stack: Where to enter a generator function, defaults to the event.
         :returns: The result of the function.
         """
-        return self.func(**{k: v(event, match) for k, v in self.func_kwargs.items()})
+        futures = [submit(dependency, event, match) for _, dependency, _ in self.parallel_plan]
+        try:
+            kwargs = self.resolve(event, match)
+        except BaseException:
+            # The parallel dependencies must be done before the event is torn down
+            wait(futures)
+            raise
+        if futures:
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+            assign_results(
+                kwargs, self.parallel_plan, results, missing_ok=self.arguments_adapter is not None
+            )
+        if self.arguments_adapter is not None:
+            kwargs = self.arguments_adapter.validate_python(kwargs)
+
+        if self.context_manager is not None:
+            if exit_stack is None:
+                exit_stack = event
+            return exit_stack.enter_context(self.context_manager(**kwargs))
+        return self.func(**kwargs)
 
+    async def solve_async(
+        self,
+        event: Event,
+        match: Match,
+        exit_stack: ExitStack | AsyncExitStack | Event | None = None,
+    ) -> T:
+        """Call the function with the dependencies, resolving async ones concurrently.
+
+        :param event: The event to inject into the dependencies.
+        :param match: The route match to inject into the dependencies.
+        :param exit_stack: Where to enter a generator function, defaults to the event.
+        :returns: The result of the function.
+        """
+        futures = [
+            asyncio.wrap_future(submit(dependency, event, match))
+            for _, dependency, _ in self.parallel_plan
+        ]
+        try:
+            kwargs = self.resolve(event, match)
+        except BaseException:
+            # The parallel dependencies must be done before the event is torn down
+            if futures:
+                await asyncio.wait(futures)
+            raise
+        if self.async_plan or futures:
+            results = await asyncio.gather(
+                *(dependency.call_async(event, match) for _, dependency, _ in self.async_plan),
+                *futures,
+                return_exceptions=True,
+            )
+            assign_results(
+                kwargs,
+                self.async_plan + self.parallel_plan,
+                results,
+                missing_ok=self.arguments_adapter is not None,
+            )
+        if self.arguments_adapter is not None:
+            kwargs = self.arguments_adapter.validate_python(kwargs)
 
-V = TypeVar("V")
+        if exit_stack is None:
+            exit_stack = event
+        if self.async_context_manager is not None:
+            cm = self.async_context_manager(**kwargs)
+            if isinstance(exit_stack, AsyncExitStack):
+                return await exit_stack.enter_async_context(cm)
+            result = await cm.__aenter__()
+            # The teardown runs after the event loop has returned the response
+            exit_stack.push(lambda *exc_info: run(cm.__aexit__(*exc_info)))
+            return result
+        if self.context_manager is not None:
+            return exit_stack.enter_context(self.context_manager(**kwargs))
+        result = self.func(**kwargs)
+        if self.is_coroutine:
+            result = await result
+        return result
 
 
-def try_except(
-    func: Callable[..., V],
-    exception: type[BaseException],
-    default: V,
-) -> Callable[..., V]:
-    """Wrap a function with a try-except block.
+def assign_results(
+    kwargs: dict[str, Any],
+    plan: list[tuple[str, Dependency, Any]],
+    results: list[Any],
+    missing_ok: bool = False,
+) -> None:
+    """Assign the results of dependencies resolved concurrently to keyword arguments.
 
-    :param func: The function to wrap.
-    :param exception: The exception to catch.
-    :param default: The default value to return.
-    :returns: The wrapped function.
+    :param kwargs: The keyword arguments to assign the results to.
+    :param plan: The name, dependency and default value of each result.
+    :param results: The results, or the exceptions raised instead.
+    :param missing_ok: Whether to leave out the missing required arguments,
+        for the validation of the arguments to report them.
+    :raises: The first exception that is not a KeyError for a parameter with
+        a default, or with `missing_ok`.
     """
+    for (name, _, default), result in zip(plan, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, KeyError):
+                raise result
+            if default is not _Required:
+                kwargs[name] = default
+            elif not missing_ok:
+                raise result
+            continue
+        kwargs[name] = result
 
-    # noinspection PyBroadException
-    def func_wrapper(*args, **kwargs) -> V:
-        try:
-            return func(*args, **kwargs)
-        except exception:
-            return default
 
-    return func_wrapper
+def compile_dependency(dependency: Dependency) -> tuple[int, Any]:
+    """Find how a Depends execution plan resolves a dependency.
+
+    Subclasses of Path, Header and Query may override how they are resolved,
+    so they are called like any other dependency.
+
+    :param dependency: The dependency to compile.
+    :returns: The way to resolve the dependency and the source to resolve it from.
+    """
+    cls = type(dependency)
+    if cls is Path:
+        return _PATH, dependency.name
+    elif cls is Header:
+        return (_HEADER_LIST if dependency.is_list else _HEADER), dependency.key
+    elif cls is Query:
+        return (_QUERY_LIST if dependency.is_list else _QUERY), dependency.name
+    return _DEPENDENCY, dependency
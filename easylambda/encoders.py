@@ -0,0 +1,135 @@
+"""The registry of encoders of request and response bodies, keyed by media type.
+
+Responses are encoded with the encoder the Accept header of the request
+prefers, falling back to JSON. Request bodies are decoded with the encoder of
+their Content-Type. msgpack is registered when installed, and other encoders,
+like CBOR, can be added with `register`.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable
+
+from easylambda import codec
+
+
+class Encoder:
+    """An encoder of bodies of a media type."""
+
+    __slots__ = ("media_type", "loads", "dumps", "binary")
+
+    def __init__(
+        self,
+        media_type: str,
+        loads: Callable[[bytes], Any],
+        dumps: Callable[[Any], str | bytes],
+        binary: bool,
+    ) -> None:
+        """Initialize the encoder.
+
+        :param media_type: The media type of the encoded bodies.
+        :param loads: Decodes a body, raising ValueError if it is invalid.
+        :param dumps: Encodes a value of JSON-compatible types.
+        :param binary: Whether the encoded bodies are binary, and so base64-encoded
+            in Lambda responses.
+        """
+        self.media_type = media_type
+        self.loads = loads
+        self.dumps = dumps
+        self.binary = binary
+
+
+JSON = Encoder("application/json", codec.loads, codec.dumps, binary=False)
+
+_encoders: dict[str, Encoder] = {JSON.media_type: JSON}
+
+
+def register(
+    media_type: str,
+    loads: Callable[[bytes], Any],
+    dumps: Callable[[Any], str | bytes],
+    *,
+    binary: bool = True,
+) -> Encoder:
+    """Register the encoder of a media type, replacing any registered before.
+
+    :param media_type: The media type of the encoded bodies.
+    :param loads: Decodes a body, raising ValueError if it is invalid.
+    :param dumps: Encodes a value of JSON-compatible types.
+    :param binary: Whether the encoded bodies are binary.
+    :returns: The encoder.
+    """
+    encoder = Encoder(media_type.lower(), loads, dumps, binary)
+    _encoders[encoder.media_type] = encoder
+    negotiate.cache_clear()
+    return encoder
+
+
+def get_encoder(media_type: str) -> Encoder | None:
+    """Get the encoder of a media type.
+
+    Media types with the +json structured syntax suffix are decoded as JSON.
+
+    :param media_type: The media type, in lowercase and without parameters.
+    :returns: The encoder, or None if no encoder is registered for the media type.
+    """
+    encoder = _encoders.get(media_type)
+    if encoder is None and media_type.endswith("+json"):
+        return JSON
+    return encoder
+
+
+@lru_cache(maxsize=64)
+def negotiate(accept: str | None) -> Encoder:
+    """Choose the encoder of a response from an Accept header.
+
+    :param accept: The value of the Accept header.
+    :returns: The encoder the client prefers, or the JSON encoder if the
+        client accepts none of the registered encoders.
+    """
+    if not accept:
+        return JSON
+
+    ranges = []
+    for index, item in enumerate(accept.split(",")):
+        media_range, *params = item.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if weight > 0:
+            ranges.append((-weight, index, media_range.strip().lower()))
+
+    for _, _, media_range in sorted(ranges):
+        if media_range in _encoders:
+            return _encoders[media_range]
+        main_type, _, sub_type = media_range.partition("/")
+        if sub_type == "*":
+            if main_type in ("*", "application"):
+                return JSON
+            for media_type, encoder in _encoders.items():
+                if media_type.startswith(main_type + "/"):
+                    return encoder
+    return JSON
+
+
+def _register_msgpack() -> None:
+    try:
+        import msgpack
+    except ImportError:
+        return
+
+    def loads(data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data)
+        except Exception as e:
+            raise ValueError(str(e)) from None
+
+    register("application/msgpack", loads, msgpack.packb)
+    register("application/x-msgpack", loads, msgpack.packb)
+
+
+_register_msgpack()
@@ -1,5 +1,4 @@
-import json
-
+from easylambda import codec
 from easylambda.aws import Response
 
 
@@ -12,7 +11,7 @@ class HttpError(Exception):
         return Response(
             statusCode=self.status_code,
             headers={"Content-Type": "application/json"},
-            body=json.dumps({"detail": self.message}),
+            body=codec.dumps({"detail": self.message}),
         )
 
 
@@ -46,6 +45,16 @@ class HttpConflict(HttpError):
         super().__init__(status_code=409, message=message)
 
 
+class HttpPayloadTooLarge(HttpError):
+    def __init__(self, message: str = "Payload Too Large") -> None:
+        super().__init__(status_code=413, message=message)
+
+
+class HttpUnsupportedMediaType(HttpError):
+    def __init__(self, message: str = "Unsupported Media Type") -> None:
+        super().__init__(status_code=415, message=message)
+
+
 class HttpUnprocessableEntity(HttpError):
     def __init__(self, message: str = "Unprocessable Entity") -> None:
         super().__init__(status_code=422, message=message)
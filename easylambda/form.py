@@ -0,0 +1,214 @@
+"""Form and file upload parameters, from urlencoded and multipart bodies.
+
+The body is parsed once per request. Multipart parts are sliced out of the
+request body buffer, so the contents of uploaded files are never copied.
+"""
+
+from typing import Match
+from urllib.parse import parse_qs
+
+from easylambda.aws import Event
+from easylambda.body import read_body
+from easylambda.dependency import Dependency
+from easylambda.errors import HttpBadRequest
+
+
+class UploadFile:
+    """A file uploaded in a multipart form."""
+
+    __slots__ = ("name", "filename", "content_type", "headers", "data")
+
+    def __init__(
+        self,
+        name: str,
+        filename: str,
+        content_type: str | None,
+        headers: dict[str, str],
+        data: memoryview,
+    ) -> None:
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.headers = headers
+        self.data = data
+
+    @property
+    def size(self) -> int:
+        """The size of the file, in bytes."""
+        return self.data.nbytes
+
+    def read(self) -> bytes:
+        """Copy the contents of the file.
+
+        :returns: The contents of the file.
+        """
+        return self.data.tobytes()
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode the contents of the file.
+
+        :param encoding: The encoding of the file.
+        :returns: The contents of the file.
+        """
+        return str(self.data, encoding)
+
+
+class FormData:
+    """The fields and files of a form."""
+
+    __slots__ = ("fields", "files")
+
+    def __init__(self) -> None:
+        self.fields: dict[str, list[str]] = {}
+        self.files: dict[str, list[UploadFile]] = {}
+
+
+class Form(Dependency):
+    """A form field, or the whole form as a dict when no name is given."""
+
+    __slots__ = ("name", "is_list")
+
+    def __init__(self, name: str | None = None, is_list: bool = False) -> None:
+        self.name = name
+        self.is_list = is_list
+
+    def __call__(self, event: Event, route: Match) -> str | list[str] | dict[str, str]:
+        fields = parse_form(event).fields
+        if self.name is None:
+            return {name: values[-1] for name, values in fields.items()}
+
+        try:
+            values = fields[self.name]
+        except KeyError:
+            if self.is_list:
+                return []
+            raise KeyError(self.name) from None
+        return values if self.is_list else values[-1]
+
+
+class File(Dependency):
+    """A file uploaded in a multipart form."""
+
+    __slots__ = ("name", "is_list")
+
+    def __init__(self, name: str, is_list: bool = False) -> None:
+        self.name = name
+        self.is_list = is_list
+
+    def __call__(self, event: Event, route: Match) -> UploadFile | list[UploadFile]:
+        try:
+            files = parse_form(event).files[self.name]
+        except KeyError:
+            if self.is_list:
+                return []
+            raise KeyError(self.name) from None
+        return files if self.is_list else files[-1]
+
+
+def parse_form(event: Event) -> FormData:
+    """Parse the form in the request body, once per request.
+
+    :param event: The event.
+    :returns: The form.
+    :raises HttpBadRequest: If the body is not a valid form.
+    """
+    try:
+        return event.cache[parse_form]
+    except KeyError:
+        pass
+
+    media_type, _, params = (event.content_type or "").partition(";")
+    media_type = media_type.strip().lower()
+    form = FormData()
+    if media_type == "multipart/form-data":
+        boundary = _get_param(params, "boundary")
+        if not boundary:
+            raise HttpBadRequest("Multipart form without boundary.")
+        parse_multipart(read_body(event), boundary.encode("latin-1"), form)
+    elif media_type == "application/x-www-form-urlencoded":
+        try:
+            body = read_body(event).decode()
+        except UnicodeDecodeError:
+            raise HttpBadRequest("Request body is not valid UTF-8.") from None
+        form.fields = parse_qs(body, keep_blank_values=True)
+    event.cache[parse_form] = form
+    return form
+
+
+def parse_multipart(body: bytes, boundary: bytes, form: FormData) -> None:
+    """Parse a multipart/form-data body.
+
+    The parts are found by scanning the body for the boundary, and their
+    contents are memoryview slices of the body.
+
+    :param body: The body.
+    :param boundary: The boundary separating the parts.
+    :param form: The form to add the fields and files to.
+    :raises HttpBadRequest: If the body is not a valid multipart body.
+    """
+    view = memoryview(body)
+    delimiter = b"\r\n--" + boundary
+
+    # The first delimiter may not be preceded by a line break
+    if body.startswith(delimiter[2:]):
+        position = len(delimiter) - 2
+    else:
+        position = body.find(delimiter)
+        if position < 0:
+            raise HttpBadRequest("Multipart form without parts.")
+        position += len(delimiter)
+
+    while True:
+        if body.startswith(b"--", position):
+            return
+        if not body.startswith(b"\r\n", position):
+            raise HttpBadRequest("Invalid multipart delimiter.")
+        position += 2
+
+        headers_end = body.find(b"\r\n\r\n", position)
+        part_end = body.find(delimiter, position)
+        if headers_end < 0 or part_end < 0 or headers_end > part_end:
+            raise HttpBadRequest("Truncated multipart part.")
+
+        headers = _parse_headers(body[position:headers_end])
+        _add_part(form, headers, view[headers_end + 4 : part_end])
+        position = part_end + len(delimiter)
+
+
+def _parse_headers(raw: bytes) -> dict[str, str]:
+    headers = {}
+    for line in raw.decode("utf-8", "replace").split("\r\n"):
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise HttpBadRequest("Invalid multipart part header.")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _add_part(form: FormData, headers: dict[str, str], data: memoryview) -> None:
+    disposition, _, params = headers.get("content-disposition", "").partition(";")
+    name = _get_param(params, "name")
+    if disposition.strip().lower() != "form-data" or name is None:
+        raise HttpBadRequest("Multipart part without form-data disposition.")
+
+    filename = _get_param(params, "filename")
+    if filename is None:
+        try:
+            value = str(data, "utf-8")
+        except UnicodeDecodeError:
+            raise HttpBadRequest(f"Form field {name!r} is not valid UTF-8.") from None
+        form.fields.setdefault(name, []).append(value)
+    else:
+        upload = UploadFile(name, filename, headers.get("content-type"), headers, data)
+        form.files.setdefault(name, []).append(upload)
+
+
+def _get_param(params: str, key: str) -> str | None:
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == key:
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1].replace('\\"', '"')
+            return value
+    return None
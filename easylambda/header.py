@@ -5,11 +5,22 @@ from easylambda.dependency import Dependency
 
 
 class Header(Dependency):
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, is_list: bool = False) -> None:
+        """Initialize the dependency.
+
+        :param name: The name of the header, matched case-insensitively.
+        :param is_list: Whether to return the values of the header as a list,
+            from repeated and comma-joined headers.
+        """
         self.name = name
+        self.key = name.lower()
+        self.is_list = is_list
 
     def __call__(self, event: Event, route: Match) -> str | list[str]:
-        try:
-            return event.headers[self.name.lower()]
-        except KeyError:
-            raise KeyError(self.name) from None
+        if self.is_list:
+            return event.get_header_list(self.key)
+
+        value = event.get_header(self.key)
+        if value is None:
+            raise KeyError(self.name)
+        return value
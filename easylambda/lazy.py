@@ -0,0 +1,90 @@
+from inspect import isclass
+from typing import Any, Callable, ClassVar, get_origin
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import core_schema
+
+_Missing = object()
+
+
+class LazyModel:
+    """A read-only view over a raw dict that validates each field on first access.
+
+    Fields are declared with annotations, like on a Pydantic model. Nested
+    LazyModel fields are wrapped without being validated, so the cost of
+    validating a field is only paid when something reads it.
+    """
+
+    _validators: ClassVar[dict[str, Callable[[Any], Any]]] = {}
+    _defaults: ClassVar[dict[str, Any]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        validators = dict(cls._validators)
+        defaults = dict(cls._defaults)
+        for name, annotation in cls.__dict__.get("__annotations__", {}).items():
+            if name.startswith("_") or get_origin(annotation) is ClassVar:
+                continue
+
+            if isclass(annotation) and issubclass(annotation, LazyModel):
+                validators[name] = annotation.model_validate
+            else:
+                validators[name] = TypeAdapter(annotation).validate_python
+
+            # Defaults must not be class attributes, or they would shadow the fields
+            default = cls.__dict__.get(name, _Missing)
+            if default is not _Missing:
+                defaults[name] = default
+                delattr(cls, name)
+
+        cls._validators = validators
+        cls._defaults = defaults
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        self.__dict__["_raw"] = raw
+
+    @classmethod
+    def model_validate(cls, value: Any) -> "LazyModel":
+        """Wrap a raw dict without validating its fields.
+
+        :param value: The raw dict, or an instance of the model.
+        :returns: The model.
+        """
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, dict):
+            raise ValueError(f"{cls.__name__} must be a dict, got {type(value).__name__}.")
+        return cls(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(cls.model_validate)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            validator = self._validators[name]
+        except KeyError:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            ) from None
+
+        try:
+            value = validator(self._raw[name])
+        except KeyError:
+            try:
+                value = self._defaults[name]
+            except KeyError:
+                raise ValidationError.from_exception_data(
+                    type(self).__name__,
+                    [{"type": "missing", "loc": (name,), "input": self._raw}],
+                ) from None
+
+        # Store the value in the instance, so later reads skip __getattr__
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__!r} object is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._raw!r})"
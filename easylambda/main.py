@@ -1,14 +1,21 @@
-import json
-import re
+from base64 import b64encode
+from collections.abc import AsyncIterator, Iterator
+from functools import wraps
 
 # noinspection PyUnresolvedReferences,PyProtectedMember
-from inspect import _empty, signature
-from typing import Any, Callable, Literal, Match, Pattern
+from inspect import _empty, isasyncgenfunction, isclass, isgeneratorfunction, signature
+from typing import Any, Callable, Literal, Match, Pattern, get_origin
 
-from pydantic import BaseModel, ValidationError, validate_call
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import PydanticSerializationError
 
+from easylambda import codec
+from easylambda.adapters import detect
 from easylambda.aws import Event, Response
+from easylambda.compression import compress_response
+from easylambda.converters import Converter, RouteMatch, compile_route
 from easylambda.depends import Depends
+from easylambda.encoders import JSON, Encoder, negotiate
 from easylambda.errors import (
     HttpError,
     HttpInternalServerError,
@@ -16,48 +23,150 @@ from easylambda.errors import (
     HttpNotFound,
     HttpUnprocessableEntity,
 )
+from easylambda.streaming import ResponseStream, StreamingResponse, write_response
 
 ALL_METHODS = frozenset(("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"))
 
+_any_adapter = TypeAdapter(Any)
+
+
+class Handler:
+    """An EasyLambda Function wrapped for dependency injection and validation."""
+
+    __slots__ = ("depends", "result_adapter")
+
+    def __init__(self, func: callable) -> None:
+        """Wrap an EasyLambda Function.
+
+        :param func: The EasyLambda Function. Its return annotation, if any,
+            is compiled into the serializer of its results.
+        """
+        if isgeneratorfunction(func) or isasyncgenfunction(func):
+            # The generator is the streamed body, not a dependency to tear down
+            generator_function = func
+
+            @wraps(generator_function)
+            def func(*args: Any, **kwargs: Any) -> Iterator[Any] | AsyncIterator[Any]:
+                return generator_function(*args, **kwargs)
+
+        self.depends = Depends(func, use_cache=False, validate=True)
+        annotation = signature(func).return_annotation
+        origin = get_origin(annotation) or annotation
+        if annotation in (_empty, None, type(None)) or (
+            isclass(origin)
+            and issubclass(origin, (Response, StreamingResponse, Iterator, AsyncIterator))
+        ):
+            self.result_adapter = None
+        else:
+            self.result_adapter = TypeAdapter(annotation)
+
+    def __call__(self, event: Event, match: Match) -> Any:
+        return self.depends(event, match)
+
+    def serialize(self, result: Any) -> str:
+        """Serialize a result of the function to JSON.
+
+        Results matching the return annotation are serialized without being
+        validated. Others are validated against it first.
+
+        :param result: The result to serialize.
+        :returns: The JSON document.
+        """
+        try:
+            if self.result_adapter is not None:
+                try:
+                    return self.result_adapter.dump_json(result, warnings="error").decode()
+                except PydanticSerializationError:
+                    result = self.result_adapter.validate_python(result)
+                    return self.result_adapter.dump_json(result).decode()
+            elif isinstance(result, BaseModel):
+                return result.model_dump_json()
+            return codec.dumps(result)
+        except (TypeError, ValueError, PydanticSerializationError):
+            raise HttpInternalServerError(message="Invalid handler response.") from None
+
+    def encode(self, result: Any, encoder: Encoder) -> str | bytes:
+        """Encode a result of the function with an encoder other than JSON.
+
+        The result is first dumped to JSON-compatible types, like it would be
+        to be serialized to JSON.
+
+        :param result: The result to encode.
+        :param encoder: The encoder.
+        :returns: The encoded body.
+        """
+        try:
+            if self.result_adapter is not None:
+                try:
+                    value = self.result_adapter.dump_python(result, mode="json", warnings="error")
+                except PydanticSerializationError:
+                    result = self.result_adapter.validate_python(result)
+                    value = self.result_adapter.dump_python(result, mode="json")
+            else:
+                value = _any_adapter.dump_python(result, mode="json")
+            return encoder.dumps(value)
+        except (TypeError, ValueError, PydanticSerializationError):
+            raise HttpInternalServerError(message="Invalid handler response.") from None
+
 
 class Application:
     """A wrapper to simplify the creation of AWS Lambda handlers."""
 
-    __slots__ = ("methods", "url_regex", "handler", "print_errors")
+    __slots__ = (
+        "methods",
+        "url_regex",
+        "handler",
+        "print_errors",
+        "compression_threshold",
+        "converters",
+    )
 
     def __init__(
         self,
         methods: set[str],
         url_regex: Pattern[str],
-        handler: Callable[[Event, Match], Any],
+        handler: Handler,
         print_errors: bool,
+        compression_threshold: int | None = None,
+        converters: dict[str, Converter] | None = None,
     ) -> None:
         self.methods = methods
         self.url_regex = url_regex
         self.handler = handler
         self.print_errors = print_errors
+        self.compression_threshold = compression_threshold
+        self.converters = converters
 
-    @validate_call
     def __call__(
         self,
         event: dict[str, Any],
         context: Any,
     ) -> dict[str, Any]:
-        """The AWS Lambda handler."""
+        """The AWS Lambda handler.
+
+        The event is validated once, by `Event`, as its fields are read. Events
+        of REST APIs and load balancers are normalized by their adapter, which
+        also shapes the response.
+        """
         if not event:
             return {}
 
+        adapter = detect(event)
         # noinspection PyBroadException
         try:
-            response = self.generate_response(Event.model_validate(event)).model_dump()
+            # Dependencies are torn down once the response is built
+            with Event.model_validate(adapter.to_event(event)) as request:
+                response = self.generate_response(request)
+                if self.compression_threshold is not None:
+                    compress_response(response, request, self.compression_threshold)
         except HttpError as e:
             response = e.to_response().model_dump()
             if self.print_errors:
                 print(response, flush=True)
-        return response
+        return adapter.to_response(response, event)
 
-    def generate_response(self, event: Event) -> Response:
-        """Generate the response for the event."""
+    def resolve(self, event: Event) -> tuple[Handler, Match]:
+        """Find the handler for the event and the match of its route."""
         # Check the URL match
         http = event.requestContext.http
         url_match = self.url_regex.match(http.path)
@@ -68,31 +177,89 @@ class Application:
         if http.method not in self.methods:
             raise HttpMethodNotAllowed()
 
+        # Convert the typed path parameters
+        if self.converters:
+            params = url_match.groupdict()
+            for name, converter in self.converters.items():
+                try:
+                    params[name] = converter.convert(params[name])
+                except ValueError:
+                    # Like values that do not match, e.g. ints over the digit limit
+                    raise HttpNotFound() from None
+            return self.handler, RouteMatch(params)
+
+        return self.handler, url_match
+
+    def stream(self, event: dict[str, Any], stream: ResponseStream) -> None:
+        """The AWS Lambda handler, streaming the response.
+
+        Responses returned as iterators or StreamingResponse are written to the
+        stream chunk by chunk. Dependencies are torn down once the whole
+        response is written.
+
+        :param event: The event.
+        :param stream: The response stream.
+        :raises: Errors other than HttpError, after failing the stream with them.
+        """
+        started = False
+        try:
+            with Event.model_validate(event) as request:
+                try:
+                    response = self.generate_response(request, buffer=False)
+                except HttpError as e:
+                    response = e.to_response().model_dump()
+                    if self.print_errors:
+                        print(response, flush=True)
+                # Once started, write_response fails the stream on errors
+                started = True
+                write_response(stream, response)
+        except Exception as e:
+            if not started:
+                stream.fail(e)
+            raise
+
+    def generate_response(self, event: Event, buffer: bool = True) -> dict[str, Any]:
+        """Generate the response for the event.
+
+        :param event: The event.
+        :param buffer: Whether to read streamed responses whole, or to return
+            them as StreamingResponse.
+        :returns: The Lambda response.
+        """
+        handler, url_match = self.resolve(event)
+
         # Call the handler
         try:
-            handler_response = self.handler(event, url_match)
+            handler_response = handler(event, url_match)
         except ValidationError as e:
             raise HttpUnprocessableEntity(str(e))
 
         # Check the handler response
-        if isinstance(handler_response, Response):
-            return handler_response
-        elif isinstance(handler_response, BaseModel):
-            status, body = 200, handler_response.model_dump_json()
+        if isinstance(handler_response, (Iterator, AsyncIterator)):
+            handler_response = StreamingResponse(handler_response)
+        if isinstance(handler_response, StreamingResponse):
+            return handler_response.buffer() if buffer else handler_response
+        elif isinstance(handler_response, Response):
+            return handler_response.model_dump()
         elif handler_response is None:
             status, body = 204, ""
+            encoder = JSON
         else:
-            try:
-                status, body = 200, json.dumps(handler_response)
-            except TypeError:
-                raise HttpInternalServerError(message="Invalid handler response.")
+            status = 200
+            encoder = negotiate(event.get_header("accept"))
+            if encoder is JSON:
+                body = handler.serialize(handler_response)
+            else:
+                body = handler.encode(handler_response, encoder)
 
         # Return the response
-        return Response(
-            statusCode=status,
-            headers={"Content-Type": "application/json"},
-            body=body,
-        )
+        return {
+            "statusCode": status,
+            "headers": {"Content-Type": encoder.media_type},
+            "isBase64Encoded": encoder.binary,
+            "multiValueHeaders": {},
+            "body": b64encode(body).decode() if encoder.binary else body,
+        }
 
 
 # noinspection PyDefaultArgument
@@ -101,26 +268,30 @@ def easylambda(
     *,
     methods: set[Literal["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"]] = ALL_METHODS,
     print_errors: bool = False,
+    compression_threshold: int | None = None,
 ) -> Callable[[callable], Callable[[dict[str, Any], Any], dict[str, Any]]]:
     """Turns a EasyLambda Function into an AWS Lambda handler.
 
-    :params route: The URL route to match.
+    :params route: The URL route to match, with parameters like {name}, or
+        {name:type} to match and convert typed values (str, int, uuid or path).
     :params methods: The HTTP methods to match.
+    :params compression_threshold: The minimum size in bytes of the response
+        bodies to compress, or None to never compress them. Compressed bodies
+        are base64-encoded, which REST APIs only decode for their binary media types.
     :returns: A decorator that turns a function into a Lambda handler.
     """
 
     def decorator(handler: callable):
         # Create the URL map and wrap the handler
-        url_regex = re.compile(r"^" + re.sub(r"{([^}]+)}", r"(?P<\1>[^/]+)", route) + r"$")
-
-        # Wrap the handler for dependency injection and validation
-        handler = Depends(validate_call(validate_return=True)(handler))
+        url_regex, converters = compile_route(route)
 
         return Application(
             methods=methods,
             url_regex=url_regex,
-            handler=handler,
+            handler=Handler(handler),
             print_errors=print_errors,
+            compression_threshold=compression_threshold,
+            converters=converters,
         )
 
     return decorator
@@ -1,4 +1,4 @@
-from typing import Match
+from typing import Any, Match
 
 from easylambda.aws import Event
 from easylambda.dependency import Dependency
@@ -6,21 +6,21 @@ from easylambda.dependency import Dependency
 
 class Query(Dependency):
     def __init__(self, name: str, is_list: bool = False) -> None:
+        """Initialize the dependency.
+
+        :param name: The name of the query parameter. Parameters in bracket
+            notation, like filter[status]=open, are read as an object by the
+            name before the brackets.
+        :param is_list: Whether to return all the values of a repeated parameter.
+        """
         self.name = name
         self.is_list = is_list
 
-    def __call__(self, event: Event, route: Match) -> str | list[str]:
-        try:
-            parsed_qs = event.parse_qs()[self.name]
-        except KeyError:
-            if self.is_list:
-                return []
-            raise KeyError(self.name) from None
-
+    def __call__(self, event: Event, route: Match) -> Any:
         if self.is_list:
-            return parsed_qs
+            return event.get_query_list(self.name)
 
-        try:
-            return parsed_qs[-1]
-        except IndexError:
-            raise KeyError(self.name) from None
+        value = event.get_query(self.name)
+        if value is None:
+            raise KeyError(self.name)
+        return value
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Literal, Match, TypeVar
+
+from easylambda.aws import Event
+from easylambda.converters import (
+    CONVERTERS,
+    PARAM_REGEX,
+    Converter,
+    RouteMatch,
+    get_converter,
+)
+from easylambda.errors import HttpMethodNotAllowed, HttpNotFound
+from easylambda.main import ALL_METHODS, Application, Handler
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+
+class RouteNode:
+    """A node of the route tree, holding one path segment."""
+
+    __slots__ = ("static", "params", "rest", "handlers")
+
+    def __init__(self) -> None:
+        self.static: dict[str, RouteNode] = {}
+        self.params: list[tuple[Converter, RouteNode]] = []
+        self.rest: RouteNode | None = None
+        self.handlers: dict[str, tuple[Handler, tuple[str, ...]]] = {}
+
+    def add_param(self, converter: Converter) -> "RouteNode":
+        """Get the child node of a parameter, creating it on first use.
+
+        :param converter: The converter of the parameter.
+        :returns: The child node.
+        """
+        for param_converter, child in self.params:
+            if param_converter is converter:
+                return child
+        child = RouteNode()
+        self.params.append((converter, child))
+        # Typed parameters are tried before the ones matching any segment
+        self.params.sort(key=lambda param: param[0] is CONVERTERS["str"])
+        return child
+
+    def accepts(self, method: str | None) -> bool:
+        """Check whether the node has a handler for a method.
+
+        :param method: The HTTP method, or None for any method.
+        :returns: Whether the node has a handler.
+        """
+        return method in self.handlers if method is not None else bool(self.handlers)
+
+    def find(
+        self,
+        segments: list[str],
+        index: int,
+        values: list[Any],
+        method: str | None = None,
+    ) -> RouteNode | None:
+        """Find the node for the path segments, collecting the parameter values.
+
+        Static segments take precedence over typed parameters, then over
+        untyped parameters, then over path parameters matching the rest of
+        the path. Branches without a handler for the method are skipped, so
+        a parameter can match a segment that is also a static route of other
+        methods. Parameter values are converted as they are matched.
+
+        :param segments: The path segments.
+        :param index: The index of the segment to match against this node's children.
+        :param values: The list to append the parameter values to.
+        :param method: The HTTP method the node must have a handler for, or
+            None for any method.
+        :returns: The node with the handlers for the path, or None if there is none.
+        """
+        if index == len(segments):
+            return self if self.accepts(method) else None
+
+        segment = segments[index]
+        child = self.static.get(segment)
+        if child is not None:
+            node = child.find(segments, index + 1, values, method)
+            if node is not None:
+                return node
+
+        if segment:
+            for converter, child in self.params:
+                try:
+                    value = converter.match(segment)
+                except ValueError:
+                    continue
+                values.append(value)
+                node = child.find(segments, index + 1, values, method)
+                if node is not None:
+                    return node
+                values.pop()
+
+            if self.rest is not None and self.rest.accepts(method):
+                values.append("/".join(segments[index:]))
+                return self.rest
+
+        return None
+
+
+class Router(Application):
+    """An AWS Lambda handler serving many routes.
+
+    Routes are compiled into a tree of path segments, so finding the handler
+    for a request does not depend on the number of routes.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(
+        self,
+        *,
+        print_errors: bool = False,
+        compression_threshold: int | None = None,
+    ) -> None:
+        """Initialize the router.
+
+        :param print_errors: Whether to print the error responses.
+        :param compression_threshold: The minimum size in bytes of the response
+            bodies to compress, or None to never compress them. Compressed
+            bodies are base64-encoded, which REST APIs only decode for their
+            binary media types.
+        """
+        self.root = RouteNode()
+        self.print_errors = print_errors
+        self.compression_threshold = compression_threshold
+
+    # noinspection PyDefaultArgument
+    def route(
+        self,
+        route: str,
+        *,
+        methods: set[Literal["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"]] = ALL_METHODS,
+    ) -> Callable[[T], T]:
+        """Register an EasyLambda Function for a route.
+
+        :param route: The URL route to match.
+        :param methods: The HTTP methods to match.
+        :returns: A decorator that registers a function as the handler of the route.
+        """
+        if not route.startswith("/"):
+            raise ValueError(f"Route {route!r} must start with '/'.")
+
+        def decorator(func: T) -> T:
+            node, names = self.root, []
+            segments = route.split("/")[1:]
+            for index, segment in enumerate(segments):
+                param = PARAM_REGEX.fullmatch(segment)
+                if param is not None:
+                    names.append(param.group(1))
+                    converter = get_converter(param.group(2))
+                    if converter is not CONVERTERS["path"]:
+                        node = node.add_param(converter)
+                    elif index == len(segments) - 1:
+                        if node.rest is None:
+                            node.rest = RouteNode()
+                        node = node.rest
+                    else:
+                        raise ValueError(f"Route {route!r} must end with its path parameter.")
+                elif "{" in segment or "}" in segment:
+                    raise ValueError(
+                        f"Route {route!r} must have parameters spanning whole path segments."
+                    )
+                else:
+                    node = node.static.setdefault(segment, RouteNode())
+
+            handler = Handler(func)
+            for method in methods:
+                if method in node.handlers:
+                    raise ValueError(f"Route {method} {route} is already registered.")
+                node.handlers[method] = (handler, tuple(names))
+            return func
+
+        return decorator
+
+    def get(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"GET"})
+
+    def post(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"POST"})
+
+    def put(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"PUT"})
+
+    def delete(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"DELETE"})
+
+    def patch(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"PATCH"})
+
+    def options(self, route: str) -> Callable[[T], T]:
+        return self.route(route, methods={"OPTIONS"})
+
+    def resolve(self, event: Event) -> tuple[Handler, Match]:
+        """Find the handler for the event and the match of its route."""
+        # Check the URL match
+        http = event.requestContext.http
+        segments = http.path.split("/")[1:]
+        values = []
+        node = self.root.find(segments, 0, values, http.method)
+        if node is None:
+            # Check whether the path has handlers for other methods
+            if self.root.find(segments, 0, [], None) is None:
+                raise HttpNotFound()
+            raise HttpMethodNotAllowed()
+
+        handler, names = node.handlers[http.method]
+        return handler, RouteMatch(dict(zip(names, values)))
@@ -0,0 +1,196 @@
+"""SQS event sources, with partial batch failure reporting.
+
+Each message of the batch is processed by the EasyLambda Function, resolving
+its dependencies for the message. Messages whose processing raises are
+reported in `batchItemFailures`, so only they are retried. This requires the
+ReportBatchItemFailures function response type on the event source mapping.
+"""
+
+import asyncio
+from traceback import print_exc, print_exception
+from typing import Any, Callable, Match, TypeVar, overload
+
+from easylambda import codec
+from easylambda.aws import SqsRecord
+from easylambda.concurrency import run, submit
+from easylambda.dependency import Dependency
+from easylambda.depends import Depends
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+
+class Message(Dependency):
+    """The body of the SQS message, parsed as JSON when it is JSON."""
+
+    __slots__ = ()
+
+    def __call__(self, event: SqsRecord, route: Match | None) -> Any:
+        # The body is parsed once per message, for all Message parameters
+        try:
+            return event.cache[Message]
+        except KeyError:
+            pass
+
+        try:
+            value = codec.loads(event.body)
+        except ValueError:
+            value = event.body
+        event.cache[Message] = value
+        return value
+
+
+class MessageAttribute(Dependency):
+    """The value of an attribute of the SQS message."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, event: SqsRecord, route: Match | None) -> str:
+        try:
+            attribute = event.messageAttributes[self.name]
+        except KeyError:
+            raise KeyError(self.name) from None
+        value = attribute.get("stringValue")
+        return attribute.get("binaryValue") if value is None else value
+
+
+class SqsHandler:
+    """An AWS Lambda handler processing the messages of SQS events."""
+
+    __slots__ = ("depends", "parallel", "print_errors")
+
+    def __init__(self, func: Callable[..., Any], parallel: bool, print_errors: bool) -> None:
+        """Wrap an EasyLambda Function.
+
+        :param func: The EasyLambda Function, called once per message.
+        :param parallel: Whether to process the messages of a batch concurrently
+            on the thread pool of the container. Async functions always process
+            them concurrently, on the event loop.
+        :param print_errors: Whether to print the tracebacks of failed messages.
+        """
+        self.depends = Depends(func, use_cache=False, validate=True)
+        self.parallel = parallel
+        self.print_errors = print_errors
+
+    def __call__(self, event: dict[str, Any], context: Any) -> dict[str, Any]:
+        """The AWS Lambda handler.
+
+        Messages of FIFO queues are processed in order, and the messages after
+        a failed one are reported as failed too, so they are retried in order.
+
+        :param event: The SQS event.
+        :param context: The Lambda context.
+        :returns: The messages to retry, as a partial batch response.
+        """
+        records = [SqsRecord.model_validate(record) for record in event.get("Records") or ()]
+        if any((record.eventSourceARN or "").endswith(".fifo") for record in records):
+            failed = self.process_fifo(records)
+        elif self.depends.is_async:
+            failed = self.process_async(records)
+        elif self.parallel:
+            futures = [submit(self.process, record) for record in records]
+            failed = [future.result() for future in futures]
+        else:
+            failed = [self.process(record) for record in records]
+
+        return {
+            "batchItemFailures": [
+                {"itemIdentifier": record.messageId}
+                for record, failure in zip(records, failed)
+                if failure
+            ]
+        }
+
+    def process(self, record: SqsRecord) -> bool:
+        """Process a message.
+
+        :param record: The message.
+        :returns: Whether processing the message failed.
+        """
+        try:
+            with record:
+                self.depends(record, None)
+        except Exception:
+            if self.print_errors:
+                print_exc()
+            return True
+        return False
+
+    def process_fifo(self, records: list[SqsRecord]) -> list[bool]:
+        """Process messages in order, until one of them fails.
+
+        :param records: The messages.
+        :returns: Whether processing each message failed, or was skipped.
+        """
+        failed = []
+        for record in records:
+            failed.append(bool(failed and failed[-1]) or self.process(record))
+        return failed
+
+    def process_async(self, records: list[SqsRecord]) -> list[bool]:
+        """Process messages concurrently on the event loop of the container.
+
+        The teardown of the dependencies of each message runs once the event
+        loop has processed them all.
+
+        :param records: The messages.
+        :returns: Whether processing each message failed.
+        """
+
+        async def process_all() -> list[Any]:
+            return await asyncio.gather(
+                *(self.depends.call_async(record, None) for record in records),
+                return_exceptions=True,
+            )
+
+        failed = []
+        for record, result in zip(records, run(process_all())):
+            failure = isinstance(result, BaseException)
+            if failure:
+                if self.print_errors:
+                    print_exception(result)
+                exc_info = (type(result), result, result.__traceback__)
+            else:
+                exc_info = (None, None, None)
+            try:
+                record.__exit__(*exc_info)
+            except Exception:
+                if self.print_errors:
+                    print_exc()
+                failure = True
+            failed.append(failure)
+        return failed
+
+
+@overload
+def sqs(func: T, /) -> SqsHandler: ...
+
+
+@overload
+def sqs(*, parallel: bool = False, print_errors: bool = False) -> Callable[[T], SqsHandler]: ...
+
+
+def sqs(
+    func: Callable[..., Any] | None = None,
+    /,
+    *,
+    parallel: bool = False,
+    print_errors: bool = False,
+) -> SqsHandler | Callable[[Callable[..., Any]], SqsHandler]:
+    """Turns an EasyLambda Function into an AWS Lambda handler of SQS events.
+
+    :param func: The EasyLambda Function, when used as a decorator without arguments.
+    :param parallel: Whether to process the messages of a batch concurrently
+        on the thread pool of the container.
+    :param print_errors: Whether to print the tracebacks of failed messages.
+    :returns: The Lambda handler, or a decorator that creates it.
+    """
+
+    def decorator(func: Callable[..., Any]) -> SqsHandler:
+        return SqsHandler(func, parallel=parallel, print_errors=print_errors)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,277 @@
+"""Response streaming, with the Lambda Function URL response streaming protocol.
+
+A handler streams its response by returning an iterator of chunks, or a
+`StreamingResponse` to set the status code and headers. Async iterators, like
+the ones of async generator handlers, are iterated on the event loop of the
+container. `Application.stream`
+writes each chunk to a `ResponseStream` as soon as the handler produces it, so
+the response is not limited by the Lambda payload size and only one chunk is
+held in memory at a time.
+
+Once the status code is sent, an error can no longer change it. Errors raised
+while streaming fail the stream instead, which Lambda records as a failed
+invocation from the error trailers of the response.
+"""
+
+from base64 import b64decode, b64encode
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from http.client import HTTPConnection
+from io import BytesIO
+from os import environ
+from traceback import format_exception, print_exc
+from typing import Any, Protocol, TypeVar
+
+from easylambda import codec
+from easylambda.concurrency import run
+
+T = TypeVar("T")
+
+# Content type of a Function URL response stream with an HTTP integration prelude
+HTTP_INTEGRATION_CONTENT_TYPE = "application/vnd.awslambda.http-integration-response"
+
+# Separates the JSON prelude from the body in the response stream
+PRELUDE_DELIMITER = b"\x00" * 8
+
+# Trailers reporting an error raised while streaming to the Runtime API
+ERROR_TYPE_TRAILER = "Lambda-Runtime-Function-Error-Type"
+ERROR_BODY_TRAILER = "Lambda-Runtime-Function-Error-Body"
+
+
+class StreamingResponse:
+    """A response whose body is produced chunk by chunk."""
+
+    __slots__ = ("content", "statusCode", "headers", "cookies")
+
+    def __init__(
+        self,
+        content: Iterable[str | bytes] | AsyncIterable[str | bytes],
+        statusCode: int = 200,
+        headers: dict[str, str] | None = None,
+        cookies: list[str] | None = None,
+    ) -> None:
+        """Initialize the response.
+
+        :param content: The chunks of the body, iterable or async iterable. Text
+            chunks are encoded as UTF-8.
+        :param statusCode: The HTTP status code.
+        :param headers: The HTTP headers, defaults to a plain text content type.
+        :param cookies: The cookies to set.
+        """
+        self.content = content
+        self.statusCode = statusCode
+        self.headers = {"Content-Type": "text/plain"} if headers is None else headers
+        self.cookies = [] if cookies is None else cookies
+
+    def chunks(self) -> Iterator[bytes]:
+        """Iterate over the chunks of the body, as bytes."""
+        content = self.content
+        if isinstance(content, AsyncIterable):
+            content = iterate_async(aiter(content))
+        for chunk in content:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield chunk
+
+    def buffer(self) -> dict[str, Any]:
+        """Read the whole body into a regular Lambda response.
+
+        :returns: The Lambda response.
+        """
+        body = b"".join(self.chunks())
+        response = {
+            "statusCode": self.statusCode,
+            "headers": self.headers,
+            "isBase64Encoded": False,
+            "multiValueHeaders": {},
+        }
+        try:
+            response["body"] = body.decode()
+        except UnicodeDecodeError:
+            response["body"] = b64encode(body).decode()
+            response["isBase64Encoded"] = True
+        if self.cookies:
+            response["cookies"] = self.cookies
+        return response
+
+
+def iterate_async(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Iterate over an async iterator, one item at a time on the event loop of the container.
+
+    :param iterator: The async iterator.
+    :returns: An iterator over its items.
+    """
+    try:
+        while True:
+            try:
+                item = run(anext(iterator))
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        # Async generators left before their end run their cleanup
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            run(aclose())
+
+
+class ResponseStream(Protocol):
+    """Where a streamed response is written to."""
+
+    def write(self, data: bytes) -> None: ...
+
+    def close(self) -> None: ...
+
+    def fail(self, error: BaseException) -> None:
+        """Close the stream, reporting that the response failed.
+
+        :param error: The error that interrupted the response.
+        """
+        ...
+
+
+class LocalResponseStream:
+    """A response stream kept in memory, standing in for Lambda to run offline."""
+
+    __slots__ = ("buffer", "writes", "closed", "error")
+
+    def __init__(self) -> None:
+        self.buffer = BytesIO()
+        self.writes = 0
+        self.closed = False
+        self.error: BaseException | None = None
+
+    def write(self, data: bytes) -> None:
+        if self.closed:
+            raise ValueError("Write to a closed response stream.")
+        self.buffer.write(data)
+        self.writes += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    def fail(self, error: BaseException) -> None:
+        self.error = error
+        self.closed = True
+
+    @property
+    def prelude(self) -> dict[str, Any]:
+        """The status code, headers and cookies written before the body."""
+        prelude, _, _ = self.buffer.getvalue().partition(PRELUDE_DELIMITER)
+        return codec.loads(prelude)
+
+    @property
+    def body(self) -> bytes:
+        """The body written after the prelude."""
+        _, _, body = self.buffer.getvalue().partition(PRELUDE_DELIMITER)
+        return body
+
+
+class RuntimeResponseStream:
+    """A response stream sent to the Lambda Runtime API of a custom runtime.
+
+    The response is sent with chunked transfer encoding, in streaming mode.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(self, request_id: str, runtime_api: str | None = None) -> None:
+        """Start the response of an invocation.
+
+        :param request_id: The id of the invocation, from the
+            Lambda-Runtime-Aws-Request-Id header of the next invocation.
+        :param runtime_api: The host and port of the Runtime API, defaults to
+            the AWS_LAMBDA_RUNTIME_API environment variable.
+        """
+        if runtime_api is None:
+            runtime_api = environ["AWS_LAMBDA_RUNTIME_API"]
+        self.connection = HTTPConnection(runtime_api)
+        self.connection.putrequest("POST", f"/2018-06-01/runtime/invocation/{request_id}/response")
+        self.connection.putheader("Lambda-Runtime-Function-Response-Mode", "streaming")
+        self.connection.putheader("Transfer-Encoding", "chunked")
+        self.connection.putheader("Content-Type", HTTP_INTEGRATION_CONTENT_TYPE)
+        self.connection.putheader("Trailer", f"{ERROR_TYPE_TRAILER}, {ERROR_BODY_TRAILER}")
+        self.connection.endheaders()
+
+    def write(self, data: bytes) -> None:
+        if data:
+            self.connection.send(b"%X\r\n%s\r\n" % (len(data), data))
+
+    def close(self) -> None:
+        self.connection.send(b"0\r\n\r\n")
+        self.end()
+
+    def fail(self, error: BaseException) -> None:
+        error_type = type(error).__name__
+        body = codec.dumps(
+            {
+                "errorMessage": str(error),
+                "errorType": error_type,
+                "stackTrace": format_exception(error),
+            }
+        )
+        self.connection.send(
+            f"0\r\n{ERROR_TYPE_TRAILER}: {error_type}\r\n"
+            f"{ERROR_BODY_TRAILER}: {b64encode(body.encode()).decode()}\r\n\r\n".encode()
+        )
+        self.end()
+
+    def end(self) -> None:
+        """Wait for the Runtime API to accept the response, and disconnect."""
+        self.connection.getresponse().read()
+        self.connection.close()
+
+
+def write_response(stream: ResponseStream, response: StreamingResponse | dict[str, Any]) -> None:
+    """Write a response to a response stream, and close the stream.
+
+    :param stream: The response stream.
+    :param response: The response, streamed or buffered.
+    :raises: The error raised while producing the body, after failing the stream with it.
+    """
+    if isinstance(response, StreamingResponse):
+        prelude = {"statusCode": response.statusCode, "headers": response.headers}
+        if response.cookies:
+            prelude["cookies"] = response.cookies
+        chunks = response.chunks()
+    else:
+        prelude = {"statusCode": response["statusCode"], "headers": response.get("headers") or {}}
+        if response.get("cookies"):
+            prelude["cookies"] = response["cookies"]
+        body = response.get("body") or ""
+        if response.get("isBase64Encoded"):
+            chunks = [b64decode(body)]
+        else:
+            chunks = [body.encode()]
+
+    try:
+        stream.write(codec.dumps(prelude).encode() + PRELUDE_DELIMITER)
+        for chunk in chunks:
+            stream.write(chunk)
+    except Exception as e:
+        stream.fail(e)
+        raise
+    stream.close()
+
+
+def serve(application: Any) -> None:
+    """Run a custom Lambda runtime that streams the responses of an application.
+
+    Use it in the bootstrap of a function whose URL has the RESPONSE_STREAM
+    invoke mode. Invocations that fail are reported to the Runtime API in the
+    error trailers of their response, and the runtime goes on to the next one.
+
+    :param application: The Application or Router to serve.
+    """
+    runtime_api = environ["AWS_LAMBDA_RUNTIME_API"]
+    while True:
+        connection = HTTPConnection(runtime_api)
+        connection.request("GET", "/2018-06-01/runtime/invocation/next")
+        invocation = connection.getresponse()
+        request_id = invocation.getheader("Lambda-Runtime-Aws-Request-Id")
+        event = codec.loads(invocation.read())
+        connection.close()
+        try:
+            application.stream(event, RuntimeResponseStream(request_id, runtime_api))
+        except Exception:
+            print_exc()
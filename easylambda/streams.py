@@ -0,0 +1,376 @@
+"""Kinesis Data Streams and DynamoDB Streams event sources.
+
+Records of a shard are processed in order. When a record fails, its sequence
+number is reported in `batchItemFailures` as the checkpoint, so Lambda
+retries the batch from it without reprocessing the records before it. This
+requires the ReportBatchItemFailures function response type on the event
+source mapping.
+
+The function is called once per record, or once per batch with `batch=True`.
+Kinesis payloads are decoded up front for the whole batch, and DynamoDB images
+are unmarshalled with plain Python, without validating each record.
+"""
+
+from abc import ABC, abstractmethod
+from base64 import b64decode
+from decimal import Decimal
+from traceback import print_exc
+from typing import Any, Callable, ClassVar, Match
+
+from easylambda import codec
+from easylambda.aws import DynamoDBRecord, EventModel, KinesisRecord, StreamBatch
+from easylambda.dependency import Dependency
+from easylambda.depends import Depends
+
+
+class Payload(Dependency):
+    """The data of the Kinesis record, parsed as JSON when it is JSON.
+
+    With `batch=True`, the list of the data of the records of the batch.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, event: KinesisRecord | StreamBatch, route: Match | None) -> Any:
+        # The payloads are decoded once per record, or per batch
+        try:
+            return event.cache[Payload]
+        except KeyError:
+            pass
+
+        if isinstance(event, StreamBatch):
+            value = decode_payloads([record["kinesis"]["data"] for record in event.Records])
+        else:
+            value = decode_payloads([event.kinesis.data])[0]
+        event.cache[Payload] = value
+        return value
+
+
+class Image(Dependency):
+    """An attribute map of the DynamoDB stream record, unmarshalled to Python values.
+
+    With `batch=True`, the list of the maps of the records of the batch, with
+    None for records without it.
+    """
+
+    __slots__ = ()
+
+    key: ClassVar[str]
+
+    def __call__(self, event: DynamoDBRecord | StreamBatch, route: Match | None) -> Any:
+        cls = type(self)
+        try:
+            return event.cache[cls]
+        except KeyError:
+            pass
+
+        if isinstance(event, StreamBatch):
+            value = [
+                None if (image := record["dynamodb"].get(cls.key)) is None else unmarshal(image)
+                for record in event.Records
+            ]
+        else:
+            image = getattr(event.dynamodb, cls.key)
+            if image is None:
+                raise KeyError(cls.key)
+            value = unmarshal(image)
+        event.cache[cls] = value
+        return value
+
+
+class NewImage(Image):
+    """The item after it was modified."""
+
+    __slots__ = ()
+    key = "NewImage"
+
+
+class OldImage(Image):
+    """The item before it was modified."""
+
+    __slots__ = ()
+    key = "OldImage"
+
+
+class Keys(Image):
+    """The key attributes of the modified item."""
+
+    __slots__ = ()
+    key = "Keys"
+
+
+# The dependencies whose values for a batch are lists with a value per record
+_BATCH_VALUES = (Payload, NewImage, OldImage, Keys)
+
+
+def decode_payloads(data: list[str]) -> list[Any]:
+    """Decode the base64 data of Kinesis records, parsing the JSON ones.
+
+    Each payload is parsed on its own: joining them into one JSON array could
+    split or merge payloads that are not JSON, like b"[1" and b"2]".
+
+    :param data: The base64 data of the records.
+    :returns: The payloads, parsed when they are JSON, as bytes otherwise.
+    """
+    values = []
+    for item in data:
+        payload = b64decode(item)
+        try:
+            values.append(codec.loads(payload))
+        except ValueError:
+            values.append(payload)
+    return values
+
+
+def unmarshal(image: dict[str, Any]) -> dict[str, Any]:
+    """Convert a DynamoDB attribute map to Python values.
+
+    Numbers are converted to int when they are integral, and to Decimal
+    otherwise, binaries to bytes and sets to Python sets.
+
+    :param image: The attribute map, like the NewImage of a stream record.
+    :returns: The item.
+    """
+    return {name: _unmarshal_value(value) for name, value in image.items()}
+
+
+def _unmarshal_value(value: dict[str, Any]) -> Any:
+    ((kind, data),) = value.items()
+    match kind:
+        case "S" | "BOOL":
+            return data
+        case "N":
+            return _unmarshal_number(data)
+        case "M":
+            return {name: _unmarshal_value(item) for name, item in data.items()}
+        case "L":
+            return [_unmarshal_value(item) for item in data]
+        case "NULL":
+            return None
+        case "B":
+            return b64decode(data)
+        case "SS":
+            return set(data)
+        case "NS":
+            return {_unmarshal_number(item) for item in data}
+        case "BS":
+            return {b64decode(item) for item in data}
+    raise ValueError(f"Unknown DynamoDB attribute type {kind!r}.")
+
+
+def _unmarshal_number(data: str) -> int | Decimal:
+    try:
+        return int(data)
+    except ValueError:
+        return Decimal(data)
+
+
+class StreamHandler(ABC):
+    """An AWS Lambda handler processing the records of stream events."""
+
+    __slots__ = ("depends", "batch", "bisect", "print_errors")
+
+    record_model: ClassVar[type[EventModel]]
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        batch: bool,
+        bisect: bool,
+        print_errors: bool,
+    ) -> None:
+        """Wrap an EasyLambda Function.
+
+        :param func: The EasyLambda Function.
+        :param batch: Whether to call the function once per batch, instead of
+            once per record.
+        :param bisect: With `batch=True`, whether to split a failed batch in
+            halves and retry them, to find the first failed record. Otherwise
+            the whole batch is retried. The function is called again for
+            records it has already processed, so it must be idempotent.
+        :param print_errors: Whether to print the tracebacks of failures.
+        """
+        self.depends = Depends(func, use_cache=False, validate=True)
+        self.batch = batch
+        self.bisect = bisect
+        self.print_errors = print_errors
+
+    def __call__(self, event: dict[str, Any], context: Any) -> dict[str, Any]:
+        """The AWS Lambda handler.
+
+        :param event: The stream event.
+        :param context: The Lambda context.
+        :returns: The checkpoint to retry from, as a partial batch response.
+        """
+        records = event.get("Records") or []
+        if self.batch:
+            failed = self.process_batch(records)
+        else:
+            failed = self.process_records(records)
+
+        if failed is None:
+            return {"batchItemFailures": []}
+        return {"batchItemFailures": [{"itemIdentifier": self.sequence_number(records[failed])}]}
+
+    @abstractmethod
+    def sequence_number(self, record: dict[str, Any]) -> str:
+        """Get the sequence number of a raw record."""
+        raise NotImplementedError
+
+    def prepare(self, records: list[dict[str, Any]], events: list[EventModel]) -> None:
+        """Decode the records in bulk before they are processed.
+
+        :param records: The raw records.
+        :param events: The events the records are processed as, a StreamBatch
+            or a record model for each record.
+        """
+
+    def process_records(self, records: list[dict[str, Any]]) -> int | None:
+        """Call the function once per record, in order, until a record fails.
+
+        :param records: The raw records.
+        :returns: The index of the failed record, or None if all succeeded.
+        """
+        events = [self.record_model.model_validate(record) for record in records]
+        self.prepare(records, events)
+        for index, event in enumerate(events):
+            if not self.call(event):
+                return index
+        return None
+
+    def process_batch(self, records: list[dict[str, Any]]) -> int | None:
+        """Call the function with the whole batch, bisecting it on failure.
+
+        :param records: The raw records.
+        :returns: The index of the first failed record, or None if all succeeded.
+        """
+        if not records:
+            return None
+
+        batch = StreamBatch({"Records": records})
+        self.prepare(records, [batch])
+        if self.call(batch):
+            return None
+        if not self.bisect:
+            return 0
+        return self.bisect_batch(batch, 0, len(records))
+
+    def bisect_batch(self, batch: StreamBatch, start: int, stop: int) -> int | None:
+        """Find the first failed record of a failed part of a batch.
+
+        :param batch: The batch, with the values decoded by `prepare`.
+        :param start: The index of the first record of the failed part.
+        :param stop: The index after the last record of the failed part.
+        :returns: The index of the first failed record, or None if the
+            records succeeded when retried.
+        """
+        if stop - start == 1:
+            return start
+
+        middle = (start + stop) // 2
+        for part_start, part_stop in ((start, middle), (middle, stop)):
+            part = StreamBatch({"Records": batch.Records[part_start:part_stop]})
+            for key in _BATCH_VALUES:
+                if key in batch.cache:
+                    part.cache[key] = batch.cache[key][part_start:part_stop]
+            if not self.call(part):
+                return self.bisect_batch(batch, part_start, part_stop)
+        return None
+
+    def call(self, event: EventModel) -> bool:
+        """Call the function for a record or a batch.
+
+        :param event: The record or the batch.
+        :returns: Whether the call succeeded.
+        """
+        try:
+            with event:
+                self.depends(event, None)
+        except Exception:
+            if self.print_errors:
+                print_exc()
+            return False
+        return True
+
+
+class KinesisHandler(StreamHandler):
+    """An AWS Lambda handler processing the records of Kinesis Data Streams events."""
+
+    __slots__ = ()
+
+    record_model = KinesisRecord
+
+    def sequence_number(self, record: dict[str, Any]) -> str:
+        return record["kinesis"]["sequenceNumber"]
+
+    def prepare(self, records: list[dict[str, Any]], events: list[EventModel]) -> None:
+        payloads = decode_payloads([record["kinesis"]["data"] for record in records])
+        if len(events) == 1 and isinstance(events[0], StreamBatch):
+            events[0].cache[Payload] = payloads
+            return
+        for event, payload in zip(events, payloads):
+            event.cache[Payload] = payload
+
+
+class DynamoDBHandler(StreamHandler):
+    """An AWS Lambda handler processing the records of DynamoDB Streams events."""
+
+    __slots__ = ()
+
+    record_model = DynamoDBRecord
+
+    def sequence_number(self, record: dict[str, Any]) -> str:
+        return record["dynamodb"]["SequenceNumber"]
+
+
+def kinesis(
+    func: Callable[..., Any] | None = None,
+    /,
+    *,
+    batch: bool = False,
+    bisect: bool = True,
+    print_errors: bool = False,
+) -> StreamHandler | Callable[[Callable[..., Any]], StreamHandler]:
+    """Turns an EasyLambda Function into an AWS Lambda handler of Kinesis events.
+
+    :param func: The EasyLambda Function, when used as a decorator without arguments.
+    :param batch: Whether to call the function once per batch, instead of once per record.
+    :param bisect: With `batch=True`, whether to split failed batches to find the failed record.
+    :param print_errors: Whether to print the tracebacks of failures.
+    :returns: The Lambda handler, or a decorator that creates it.
+    """
+    return _decorate(KinesisHandler, func, batch, bisect, print_errors)
+
+
+def dynamodb(
+    func: Callable[..., Any] | None = None,
+    /,
+    *,
+    batch: bool = False,
+    bisect: bool = True,
+    print_errors: bool = False,
+) -> StreamHandler | Callable[[Callable[..., Any]], StreamHandler]:
+    """Turns an EasyLambda Function into an AWS Lambda handler of DynamoDB Streams events.
+
+    :param func: The EasyLambda Function, when used as a decorator without arguments.
+    :param batch: Whether to call the function once per batch, instead of once per record.
+    :param bisect: With `batch=True`, whether to split failed batches to find the failed record.
+    :param print_errors: Whether to print the tracebacks of failures.
+    :returns: The Lambda handler, or a decorator that creates it.
+    """
+    return _decorate(DynamoDBHandler, func, batch, bisect, print_errors)
+
+
+def _decorate(
+    handler_class: type[StreamHandler],
+    func: Callable[..., Any] | None,
+    batch: bool,
+    bisect: bool,
+    print_errors: bool,
+) -> StreamHandler | Callable[[Callable[..., Any]], StreamHandler]:
+    def decorator(func: Callable[..., Any]) -> StreamHandler:
+        return handler_class(func, batch=batch, bisect=bisect, print_errors=print_errors)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,103 @@
+"""Compare the Depends execution plan with resolving parameters through closures.
+
+Run from the repository root with ``python -m examples.bench_depends``.
+"""
+
+from inspect import Signature, isclass, signature
+from timeit import repeat
+from typing import Annotated, Any, Callable, TypeVar, get_args, get_origin
+
+from easylambda.aws import Event
+from easylambda.dependency import Dependency
+from easylambda.depends import Depends
+from easylambda.header import Header
+from easylambda.path import Path
+from easylambda.query import Query
+from easylambda.router import RouteMatch
+
+V = TypeVar("V")
+
+
+def try_except(
+    func: Callable[..., V],
+    exception: type[BaseException],
+    default: V,
+) -> Callable[..., V]:
+    """Wrap a function with a try-except block.
+
+    :param func: The function to wrap.
+    :param exception: The exception to catch.
+    :param default: The default value to return.
+    :returns: The wrapped function.
+    """
+
+    # noinspection PyBroadException
+    def func_wrapper(*args, **kwargs) -> V:
+        try:
+            return func(*args, **kwargs)
+        except exception:
+            return default
+
+    return func_wrapper
+
+
+class ClosureDepends(Dependency):
+    """Depends as it was: one closure per parameter, called on every request."""
+
+    def __init__(self, func: Any) -> None:
+        self.func = func
+        self.func_kwargs = {}
+        for k, p in signature(func).parameters.items():
+            has_default = p.default is not Signature.empty
+            if get_origin(p.annotation) is not Annotated:
+                self.func_kwargs[k] = lambda event, match, default=p.default: default
+                continue
+            for m in get_args(p.annotation):
+                if isclass(m) and issubclass(m, Dependency):
+                    m = m()
+                if isinstance(m, Dependency):
+                    self.func_kwargs[k] = try_except(m, KeyError, p.default) if has_default else m
+                    break
+
+    def __call__(self, event: Event, match: Any) -> Any:
+        return self.func(**{k: v(event, match) for k, v in self.func_kwargs.items()})
+
+
+def handler(
+    item_id: Annotated[str, Path("item_id")],
+    user_agent: Annotated[str | None, Header("user-agent")] = None,
+    authorization: Annotated[str | None, Header("authorization")] = None,
+    skip: Annotated[str, Query("skip")] = "0",
+    limit: Annotated[str, Query("limit")] = "10",
+    tags: Annotated[list[str], Query("tag", is_list=True)] = [],
+    verbose: bool = False,
+) -> tuple:
+    return item_id, user_agent, authorization, skip, limit, tags, verbose
+
+
+EVENT = Event.model_validate(
+    {
+        "rawQueryString": "skip=5&tag=a&tag=b",
+        "headers": {"user-agent": "agent"},
+    }
+)
+MATCH = RouteMatch({"item_id": "123"})
+
+
+def main(number: int = 100_000) -> None:
+    calls = {
+        "closures": ClosureDepends(handler),
+        "plan": Depends(handler, use_cache=False),
+    }
+    timings = {}
+    for name, depends in calls.items():
+        assert depends(EVENT, MATCH) == calls["closures"](EVENT, MATCH)
+        timings[name] = (
+            min(repeat(lambda: depends(EVENT, MATCH), number=number, repeat=5)) / number * 1e6
+        )
+        print(f"{name:>8}: {timings[name]:.2f} µs per call")
+    print(f"{'speedup':>8}: {timings['closures'] / timings['plan']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
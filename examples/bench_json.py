@@ -0,0 +1,45 @@
+"""Compare the JSON backends parsing and encoding payloads of different sizes.
+
+Run from the repository root with ``python -m examples.bench_json``.
+"""
+
+from timeit import repeat
+
+from easylambda import codec
+
+WHATSAPP_MESSAGE = '{"object":"whatsapp_business_account","entry":[{"id":"0","changes":[{"field":"messages","value":{"messaging_product":"whatsapp","metadata":{"display_phone_number":"16505551111","phone_number_id":"123456123"},"contacts":[{"profile":{"name":"test user name"},"wa_id":"16315551181"}],"messages":[{"from":"16315551181","id":"ABGGFlA5Fpa","timestamp":"1504902988","type":"text","text":{"body":"this is a text message"}}]}}]}]}'
+
+PAYLOADS = {
+    "small": '{"message": "Hello World!"}',
+    "whatsapp": WHATSAPP_MESSAGE,
+    "whatsapp x100": '{"batch": [' + ",".join([WHATSAPP_MESSAGE] * 100) + "]}",
+    "whatsapp x1000": '{"batch": [' + ",".join([WHATSAPP_MESSAGE] * 1000) + "]}",
+}
+
+
+def main() -> None:
+    backends = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec.use_backend(name)
+        except ImportError:
+            print(f"{name} is not installed, skipping it")
+            continue
+        backends.append(name)
+
+    print(f"{'payload':>16} {'size':>9} {'backend':>8} {'loads':>12} {'dumps':>12}")
+    for payload_name, payload in PAYLOADS.items():
+        number = max(10, 2_000_000 // len(payload))
+        for name in backends:
+            codec.use_backend(name)
+            value = codec.loads(payload)
+            loads = min(repeat(lambda: codec.loads(payload), number=number, repeat=5))
+            dumps = min(repeat(lambda: codec.dumps(value), number=number, repeat=5))
+            print(
+                f"{payload_name:>16} {len(payload):>8}B {name:>8} "
+                f"{loads / number * 1e6:>9.2f} µs {dumps / number * 1e6:>9.2f} µs"
+            )
+
+
+if __name__ == "__main__":
+    main()
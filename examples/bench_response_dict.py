@@ -0,0 +1,71 @@
+"""Measure the per-invocation cost of validating the Lambda handler arguments.
+
+Run from the repository root with ``python -m examples.bench_response_dict``.
+"""
+
+from timeit import repeat
+
+from pydantic import validate_call
+
+from easylambda import get
+from easylambda.main import Application
+
+EVENT = {
+    "version": "2.0",
+    "routeKey": "$default",
+    "rawPath": "/",
+    "rawQueryString": "",
+    "cookies": [],
+    "headers": {},
+    "queryStringParameters": {},
+    "requestContext": {
+        "accountId": "123456789012",
+        "apiId": "<urlid>",
+        "authentication": None,
+        "authorizer": None,
+        "domainName": "url-id.lambda-url.us-west-2.on.aws",
+        "domainPrefix": "url-id",
+        "http": {
+            "method": "GET",
+            "path": "/",
+            "protocol": "HTTP/1.1",
+            "sourceIp": "123.123.123.123",
+            "userAgent": "agent",
+        },
+        "requestId": "id",
+        "routeKey": "$default",
+        "stage": "$default",
+        "time": "12/Mar/2020:19:03:58 +0000",
+        "timeEpoch": 1583348638390,
+    },
+    "body": "",
+    "pathParameters": None,
+    "isBase64Encoded": False,
+    "stageVariables": None,
+}
+
+
+@get("/")
+def lambda_handler() -> dict:
+    return {"message": "Hello World!"}
+
+
+# The entry point as it was, with Pydantic validating the event and context arguments
+validated_call = validate_call(Application.__call__)
+
+
+def main(number: int = 20_000) -> None:
+    context = object()
+    calls = {
+        "validate_call": lambda: validated_call(lambda_handler, EVENT, context),
+        "direct": lambda: lambda_handler(EVENT, context),
+    }
+    timings = {}
+    for name, func in calls.items():
+        timings[name] = min(repeat(func, number=number, repeat=5)) / number * 1e6
+        print(f"{name:>14}: {timings[name]:.2f} µs per invocation")
+    print(f"{'saving':>14}: {timings['validate_call'] - timings['direct']:.2f} µs per invocation")
+
+
+if __name__ == "__main__":
+    main()
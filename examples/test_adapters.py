@@ -0,0 +1,151 @@
+import json
+from typing import Annotated
+
+import pytest
+
+from easylambda import Router
+from easylambda.adapters import EventAdapter
+from easylambda.aws import Response
+from easylambda.body import Body
+from easylambda.header import Header
+from easylambda.path import Path
+from easylambda.query import Query
+
+lambda_handler = Router()
+
+
+@lambda_handler.post("/items/{item_id}")
+def update_item(
+    item_id: Annotated[int, Path("item_id")],
+    tags: Annotated[list[str], Query("tag", is_list=True)],
+    accept: Annotated[str, Header("Accept")],
+    item: Annotated[dict, Body],
+) -> dict:
+    return {"item_id": item_id, "tags": tags, "accept": accept, "item": item}
+
+
+@lambda_handler.get("/login")
+def login() -> Response:
+    return Response(
+        statusCode=302,
+        headers={"Location": "/home"},
+        multiValueHeaders={"Set-Cookie": ["session=abc; HttpOnly"]},
+    )
+
+
+REST_EVENT = {
+    "resource": "/items/{item_id}",
+    "path": "/items/7",
+    "httpMethod": "POST",
+    "headers": {"Accept": "application/json", "Content-Type": "application/json"},
+    "multiValueHeaders": {
+        "Accept": ["application/json"],
+        "Content-Type": ["application/json"],
+    },
+    "queryStringParameters": {"tag": "b c"},
+    "multiValueQueryStringParameters": {"tag": ["a", "b c"]},
+    "pathParameters": {"item_id": "7"},
+    "stageVariables": None,
+    "requestContext": {
+        "accountId": "123456789012",
+        "apiId": "1234567890",
+        "httpMethod": "POST",
+        "identity": {"sourceIp": "127.0.0.1", "userAgent": "agent"},
+        "path": "/prod/items/7",
+        "protocol": "HTTP/1.1",
+        "requestId": "c6af9ac6-7b61-11e6-9a41-93e8deadbeef",
+        "resourcePath": "/items/{item_id}",
+        "stage": "prod",
+    },
+    "body": '{"name": "pen"}',
+    "isBase64Encoded": False,
+}
+
+
+ALB_EVENT = {
+    "requestContext": {
+        "elb": {
+            "targetGroupArn": "arn:aws:elasticloadbalancing:us-east-2:123456789012:"
+            "targetgroup/lambda/50dc6c495c0c9188"
+        }
+    },
+    "httpMethod": "POST",
+    "path": "/items/7",
+    "queryStringParameters": {"tag": "b%20c"},
+    "headers": {
+        "accept": "application/json",
+        "content-type": "application/json",
+        "x-forwarded-for": "72.12.164.125",
+    },
+    "body": '{"name": "pen"}',
+    "isBase64Encoded": False,
+}
+
+
+def test_rest_api_event() -> None:
+    response = lambda_handler(REST_EVENT, None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "item_id": 7,
+        "tags": ["a", "b c"],
+        "accept": "application/json",
+        "item": {"name": "pen"},
+    }
+
+
+def test_rest_api_response() -> None:
+    event = {**REST_EVENT, "path": "/login", "httpMethod": "GET", "body": None}
+    response = lambda_handler(event, None)
+    assert response["statusCode"] == 302
+    assert response["headers"] == {"Location": "/home"}
+    assert response["multiValueHeaders"] == {"Set-Cookie": ["session=abc; HttpOnly"]}
+
+
+def test_alb_event() -> None:
+    response = lambda_handler(ALB_EVENT, None)
+    assert response == {
+        "statusCode": 200,
+        "statusDescription": "200 OK",
+        "isBase64Encoded": False,
+        "headers": {"Content-Type": "application/json"},
+        "body": response["body"],
+    }
+    assert json.loads(response["body"]) == {
+        "item_id": 7,
+        "tags": ["b c"],
+        "accept": "application/json",
+        "item": {"name": "pen"},
+    }
+
+
+def test_alb_event_with_multi_value_headers() -> None:
+    event = {
+        "requestContext": ALB_EVENT["requestContext"],
+        "httpMethod": "GET",
+        "path": "/login",
+        "multiValueQueryStringParameters": {},
+        "multiValueHeaders": {"accept": ["*/*"]},
+        "body": "",
+        "isBase64Encoded": False,
+    }
+    response = lambda_handler(event, None)
+    assert response["statusDescription"] == "302 Found"
+    assert "headers" not in response
+    assert response["multiValueHeaders"] == {
+        "Location": ["/home"],
+        "Set-Cookie": ["session=abc; HttpOnly"],
+    }
+
+
+def test_errors_are_shaped_for_the_front_door() -> None:
+    response = lambda_handler({**ALB_EVENT, "path": "/missing"}, None)
+    assert response["statusCode"] == 404
+    assert response["statusDescription"] == "404 Not Found"
+
+
+def test_adapters_must_define_matches() -> None:
+    class IncompleteAdapter(EventAdapter):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        IncompleteAdapter()
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from typing import Annotated
+
+from easylambda import get
+from easylambda.depends import Depends
+from easylambda.path import Path
+
+running = {"now": 0, "max": 0}
+
+
+async def lookup(name: str) -> str:
+    running["now"] += 1
+    running["max"] = max(running["max"], running["now"])
+    await asyncio.sleep(0.01)
+    running["now"] -= 1
+    return name
+
+
+async def get_user(user_id: Annotated[str, Path("user_id")]) -> str:
+    return await lookup(f"user {user_id}")
+
+
+async def get_orders(user_id: Annotated[str, Path("user_id")]) -> str:
+    return await lookup(f"orders of {user_id}")
+
+
+async def get_invoices(user_id: Annotated[str, Path("user_id")]) -> str:
+    return await lookup(f"invoices of {user_id}")
+
+
+@get("/users/{user_id}")
+async def lambda_handler(
+    user: Annotated[str, Depends(get_user)],
+    orders: Annotated[str, Depends(get_orders)],
+    invoices: Annotated[str, Depends(get_invoices)],
+) -> dict:
+    return {
+        "user": user,
+        "orders": orders,
+        "invoices": invoices,
+        "loop": id(asyncio.get_running_loop()),
+    }
+
+
+def test_dependencies_run_concurrently_on_one_loop() -> None:
+    running["max"] = 0
+    bodies = []
+    for _ in range(2):
+        response = lambda_handler(
+            {
+                "version": "2.0",
+                "routeKey": "$default",
+                "rawPath": "/users/1",
+                "rawQueryString": "",
+                "cookies": [],
+                "headers": {},
+                "queryStringParameters": {},
+                "requestContext": {
+                    "accountId": "123456789012",
+                    "apiId": "<urlid>",
+                    "authentication": None,
+                    "authorizer": None,
+                    "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                    "domainPrefix": "url-id",
+                    "http": {
+                        "method": "GET",
+                        "path": "/users/1",
+                        "protocol": "HTTP/1.1",
+                        "sourceIp": "123.123.123.123",
+                        "userAgent": "agent",
+                    },
+                    "requestId": "id",
+                    "routeKey": "$default",
+                    "stage": "$default",
+                    "time": "12/Mar/2020:19:03:58 +0000",
+                    "timeEpoch": 1583348638390,
+                },
+                "body": "",
+                "pathParameters": None,
+                "isBase64Encoded": False,
+                "stageVariables": None,
+            },
+            object(),
+        )
+        assert response["statusCode"] == 200
+        bodies.append(json.loads(response["body"]))
+
+    assert running["max"] == 3
+    assert bodies[0]["user"] == "user 1"
+    assert bodies[0]["orders"] == "orders of 1"
+    assert bodies[0]["invoices"] == "invoices of 1"
+    assert bodies[0]["loop"] == bodies[1]["loop"]
@@ -0,0 +1,100 @@
+import gzip
+import json
+import zlib
+from base64 import b64encode
+from typing import Annotated
+
+import pytest
+
+from easylambda import body, post
+from easylambda.body import Body
+from easylambda.compression import decompress
+
+
+@post("/batch")
+def lambda_handler(
+    batch: Annotated[list[dict], Body(max_size=64 * 1024)],
+    same_batch: Annotated[list[dict], Body],
+) -> dict:
+    return {"count": len(batch), "same": batch == same_batch}
+
+
+def make_event(body: bytes, encoding: str | None) -> dict:
+    headers = {"content-type": "application/json"}
+    if encoding is not None:
+        headers["content-encoding"] = encoding
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/batch",
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": headers,
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "POST",
+                "path": "/batch",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": b64encode(body).decode(),
+        "pathParameters": None,
+        "isBase64Encoded": True,
+        "stageVariables": None,
+    }
+
+
+BATCH = json.dumps([{"event": "tap", "index": i} for i in range(100)]).encode()
+
+
+def test_gzip_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(body, "decompress", lambda *args: calls.append(args) or decompress(*args))
+
+    response = lambda_handler(make_event(gzip.compress(BATCH), "gzip"), None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"count": 100, "same": True}
+    assert len(calls) == 1
+
+
+def test_deflate_body() -> None:
+    response = lambda_handler(make_event(zlib.compress(BATCH), "deflate"), None)
+    assert json.loads(response["body"]) == {"count": 100, "same": True}
+
+    # Raw deflate, without the zlib header
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    raw = compressor.compress(BATCH) + compressor.flush()
+    response = lambda_handler(make_event(raw, "deflate"), None)
+    assert json.loads(response["body"]) == {"count": 100, "same": True}
+
+
+def test_decompression_bomb_is_rejected() -> None:
+    bomb = gzip.compress(b"[" + b" " * (1024 * 1024) + b"]")
+    assert len(bomb) < 2048
+    response = lambda_handler(make_event(bomb, "gzip"), None)
+    assert response["statusCode"] == 413
+
+
+def test_invalid_encoding() -> None:
+    response = lambda_handler(make_event(BATCH, "gzip"), None)
+    assert response["statusCode"] == 400
+
+    response = lambda_handler(make_event(gzip.compress(BATCH)[:-10], "gzip"), None)
+    assert response["statusCode"] == 400
+
+    response = lambda_handler(make_event(BATCH, "compress"), None)
+    assert response["statusCode"] == 415
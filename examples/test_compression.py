@@ -0,0 +1,98 @@
+import gzip
+import json
+from base64 import b64decode
+from typing import Annotated
+
+from easylambda import easylambda, get
+from easylambda.compression import choose_encoding
+from easylambda.query import Query
+
+
+@easylambda("/items", methods={"GET"}, compression_threshold=1024)
+def lambda_handler(limit: Annotated[int, Query("limit")] = 100) -> list[dict]:
+    return [{"item_id": i, "name": f"item {i}"} for i in range(limit)]
+
+
+def make_event(query: str, headers: dict) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/items",
+        "rawQueryString": query,
+        "cookies": [],
+        "headers": headers,
+        "queryStringParameters": dict(item.split("=") for item in query.split("&") if item),
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "GET",
+                "path": "/items",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+
+def test_large_response_is_compressed() -> None:
+    response = lambda_handler(make_event("", {"accept-encoding": "gzip, deflate"}), None)
+    assert response["statusCode"] == 200
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Content-Type"] == "application/json"
+    body = gzip.decompress(b64decode(response["body"]))
+    assert len(response["body"]) < len(body)
+    assert json.loads(body) == [{"item_id": i, "name": f"item {i}"} for i in range(100)]
+
+
+def test_small_response_is_not_compressed() -> None:
+    response = lambda_handler(make_event("limit=2", {"accept-encoding": "gzip"}), None)
+    assert response["isBase64Encoded"] is False
+    assert "Content-Encoding" not in response["headers"]
+    assert json.loads(response["body"]) == [
+        {"item_id": 0, "name": "item 0"},
+        {"item_id": 1, "name": "item 1"},
+    ]
+
+
+def test_response_is_not_compressed_without_accept_encoding() -> None:
+    response = lambda_handler(make_event("", {}), None)
+    assert response["isBase64Encoded"] is False
+    assert "Content-Encoding" not in response["headers"]
+
+    response = lambda_handler(make_event("", {"accept-encoding": "identity"}), None)
+    assert response["isBase64Encoded"] is False
+
+
+def test_compression_is_disabled_by_default() -> None:
+    @get("/items")
+    def default_handler() -> list[dict]:
+        return [{"item_id": i, "name": f"item {i}"} for i in range(100)]
+
+    response = default_handler(make_event("", {"accept-encoding": "gzip"}), None)
+    assert response["isBase64Encoded"] is False
+    assert "Content-Encoding" not in response["headers"]
+
+
+def test_choose_encoding() -> None:
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("GZIP;q=0.5, identity") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") is not None
+    assert choose_encoding("*, gzip;q=0") in ("br", None)
+    assert choose_encoding("deflate") is None
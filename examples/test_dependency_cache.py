@@ -0,0 +1,80 @@
+import json
+from typing import Annotated
+
+from easylambda import get
+from easylambda.depends import Depends
+from easylambda.errors import HttpUnauthorized
+from easylambda.header import Header
+
+decoded_tokens = []
+
+
+def get_user(authorization: Annotated[str, Header("authorization")]) -> str:
+    decoded_tokens.append(authorization)
+    return authorization.removeprefix("Bearer ")
+
+
+def get_name(user: Annotated[str, Depends(get_user)]) -> str:
+    return user.title()
+
+
+def get_permissions(user: Annotated[str, Depends(get_user)]) -> list[str]:
+    if user != "admin":
+        raise HttpUnauthorized()
+    return ["read", "write"]
+
+
+@get("/")
+def lambda_handler(
+    name: Annotated[str, Depends(get_name)],
+    permissions: Annotated[list[str], Depends(get_permissions)],
+) -> dict:
+    return {"name": name, "permissions": permissions}
+
+
+def test_shared_dependency_runs_once_per_request() -> None:
+    decoded_tokens.clear()
+    for _ in range(2):
+        response = lambda_handler(
+            {
+                "version": "2.0",
+                "routeKey": "$default",
+                "rawPath": "/",
+                "rawQueryString": "",
+                "cookies": [],
+                "headers": {
+                    "authorization": "Bearer admin",
+                },
+                "queryStringParameters": {},
+                "requestContext": {
+                    "accountId": "123456789012",
+                    "apiId": "<urlid>",
+                    "authentication": None,
+                    "authorizer": None,
+                    "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                    "domainPrefix": "url-id",
+                    "http": {
+                        "method": "GET",
+                        "path": "/",
+                        "protocol": "HTTP/1.1",
+                        "sourceIp": "123.123.123.123",
+                        "userAgent": "agent",
+                    },
+                    "requestId": "id",
+                    "routeKey": "$default",
+                    "stage": "$default",
+                    "time": "12/Mar/2020:19:03:58 +0000",
+                    "timeEpoch": 1583348638390,
+                },
+                "body": "",
+                "pathParameters": None,
+                "isBase64Encoded": False,
+                "stageVariables": None,
+            },
+            object(),
+        )
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"name": "Admin", "permissions": ["read", "write"]}
+
+    assert decoded_tokens == ["Bearer admin", "Bearer admin"]
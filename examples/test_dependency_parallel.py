@@ -0,0 +1,161 @@
+import json
+from threading import Barrier
+from time import sleep
+from typing import Annotated, Iterator
+
+from easylambda import get
+from easylambda.depends import Depends
+from easylambda.errors import HttpUnauthorized
+from easylambda.header import Header
+
+# Each blocking call waits for the others, so they must run at the same time
+barrier = Barrier(3, timeout=5)
+issued_tokens = []
+
+
+def get_token(authorization: Annotated[str, Header("authorization")]) -> str:
+    issued_tokens.append(authorization)
+    return authorization.removeprefix("Bearer ")
+
+
+def fetch_profile(token: Annotated[str, Depends(get_token)]) -> str:
+    barrier.wait()
+    return f"profile of {token}"
+
+
+def fetch_settings(token: Annotated[str, Depends(get_token)]) -> str:
+    barrier.wait()
+    return f"settings of {token}"
+
+
+def fetch_history(token: Annotated[str, Depends(get_token)]) -> str:
+    barrier.wait()
+    return f"history of {token}"
+
+
+@get("/")
+def lambda_handler(
+    profile: Annotated[str, Depends(fetch_profile, parallel=True)],
+    settings: Annotated[str, Depends(fetch_settings, parallel=True)],
+    history: Annotated[str, Depends(fetch_history, parallel=True)],
+) -> dict:
+    return {"profile": profile, "settings": settings, "history": history}
+
+
+log = []
+
+
+def open_connection() -> Iterator[str]:
+    sleep(0.05)
+    log.append("open")
+    try:
+        yield "connection"
+    finally:
+        log.append("close")
+
+
+def check_authorization(authorization: Annotated[str, Header("authorization")]) -> None:
+    raise HttpUnauthorized()
+
+
+@get("/")
+def failing_handler(
+    connection: Annotated[str, Depends(open_connection, parallel=True)],
+    user: Annotated[None, Depends(check_authorization)],
+) -> dict:
+    return {"connection": connection}
+
+
+def test_blocking_dependencies_run_in_parallel() -> None:
+    issued_tokens.clear()
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/",
+            "rawQueryString": "",
+            "cookies": [],
+            "headers": {
+                "authorization": "Bearer user",
+            },
+            "queryStringParameters": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "profile": "profile of user",
+        "settings": "settings of user",
+        "history": "history of user",
+    }
+    assert issued_tokens == ["Bearer user"]
+
+
+def test_parallel_dependencies_are_torn_down_when_a_sibling_fails() -> None:
+    log.clear()
+    response = failing_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/",
+            "rawQueryString": "",
+            "cookies": [],
+            "headers": {
+                "authorization": "Bearer user",
+            },
+            "queryStringParameters": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 401
+    assert log == ["open", "close"]
@@ -0,0 +1,146 @@
+import json
+from time import sleep
+from typing import Annotated, AsyncIterator
+
+from easylambda import get
+from easylambda.depends import Depends
+
+created_clients = []
+
+
+def make_client() -> dict:
+    client = {"client_id": len(created_clients)}
+    created_clients.append(client)
+    return client
+
+
+client = Depends(make_client, scope="container")
+
+
+@get("/")
+def lambda_handler(client: Annotated[dict, client]) -> dict:
+    return client
+
+
+event = {
+    "version": "2.0",
+    "routeKey": "$default",
+    "rawPath": "/",
+    "rawQueryString": "",
+    "cookies": [],
+    "headers": {},
+    "queryStringParameters": {},
+    "requestContext": {
+        "accountId": "123456789012",
+        "apiId": "<urlid>",
+        "authentication": None,
+        "authorizer": None,
+        "domainName": "url-id.lambda-url.us-west-2.on.aws",
+        "domainPrefix": "url-id",
+        "http": {
+            "method": "GET",
+            "path": "/",
+            "protocol": "HTTP/1.1",
+            "sourceIp": "123.123.123.123",
+            "userAgent": "agent",
+        },
+        "requestId": "id",
+        "routeKey": "$default",
+        "stage": "$default",
+        "time": "12/Mar/2020:19:03:58 +0000",
+        "timeEpoch": 1583348638390,
+    },
+    "body": "",
+    "pathParameters": None,
+    "isBase64Encoded": False,
+    "stageVariables": None,
+}
+
+
+def test_reused_across_invocations() -> None:
+    client.invalidate()
+    created_clients.clear()
+
+    first = lambda_handler(event, object())
+    second = lambda_handler(event, object())
+
+    assert json.loads(first["body"]) == {"client_id": 0}
+    assert json.loads(second["body"]) == {"client_id": 0}
+    assert len(created_clients) == 1
+
+
+def test_invalidate() -> None:
+    client.invalidate()
+    created_clients.clear()
+
+    lambda_handler(event, object())
+    client.invalidate()
+    response = lambda_handler(event, object())
+
+    assert json.loads(response["body"]) == {"client_id": 1}
+    assert len(created_clients) == 2
+
+
+connections = []
+
+
+async def connect() -> AsyncIterator[int]:
+    connection_id = sum(entry.startswith("open") for entry in connections)
+    connections.append(f"open {connection_id}")
+    yield connection_id
+    connections.append(f"close {connection_id}")
+
+
+connection = Depends(connect, scope="container", ttl=0.01)
+
+
+@get("/")
+async def async_handler(connection_id: Annotated[int, connection]) -> dict:
+    return {"connection": connection_id}
+
+
+@get("/")
+async def invalidating_handler(connection_id: Annotated[int, connection]) -> dict:
+    connection.invalidate()
+    return {"connection": connection_id}
+
+
+def test_async_teardown_on_expiry() -> None:
+    connection.invalidate()
+    connections.clear()
+
+    first = async_handler(event, object())
+    sleep(0.02)
+    second = async_handler(event, object())
+
+    assert json.loads(first["body"]) == {"connection": 0}
+    assert json.loads(second["body"]) == {"connection": 1}
+    assert connections == ["open 0", "close 0", "open 1"]
+
+
+def test_async_invalidate_on_the_event_loop() -> None:
+    connection.invalidate()
+    connections.clear()
+
+    first = invalidating_handler(event, object())
+    second = async_handler(event, object())
+
+    assert json.loads(first["body"]) == {"connection": 0}
+    assert json.loads(second["body"]) == {"connection": 1}
+    assert connections == ["open 0", "close 0", "open 1"]
+
+
+def test_shared_by_the_depends_of_a_function() -> None:
+    client.invalidate()
+    created_clients.clear()
+    other_client = Depends(make_client, scope="container")
+
+    @get("/")
+    def other_handler(client: Annotated[dict, other_client]) -> dict:
+        return client
+
+    first = lambda_handler(event, object())
+    second = other_handler(event, object())
+
+    assert json.loads(first["body"]) == json.loads(second["body"]) == {"client_id": 0}
+    assert len(created_clients) == 1
@@ -0,0 +1,184 @@
+import json
+from typing import Annotated, Iterator
+
+from easylambda import get
+from easylambda.depends import Depends
+from easylambda.errors import HttpNotFound
+from easylambda.path import Path
+from easylambda.streaming import LocalResponseStream
+
+pool = ["connection"]
+log = []
+
+
+def get_connection() -> Iterator[str]:
+    connection = pool.pop()
+    log.append(f"acquire {connection}")
+    try:
+        yield connection
+    finally:
+        log.append(f"release {connection}")
+        pool.append(connection)
+
+
+@get("/items/{item_id}")
+def lambda_handler(
+    item_id: Annotated[str, Path("item_id")],
+    connection: Annotated[str, Depends(get_connection)],
+) -> dict:
+    log.append(f"handle {item_id}")
+    if item_id == "missing":
+        raise HttpNotFound()
+    return {"connection": connection, "in_use": pool == []}
+
+
+def get_transaction() -> Iterator[str]:
+    log.append("begin")
+    try:
+        yield "transaction"
+    except Exception:
+        # Rolls back without re-raising, which must not hide the error
+        log.append("rollback")
+
+
+@get("/orders/{order_id}")
+def order_handler(
+    order_id: Annotated[str, Path("order_id")],
+    transaction: Annotated[str, Depends(get_transaction)],
+) -> dict:
+    raise HttpNotFound()
+
+
+def test_teardown_after_response() -> None:
+    log.clear()
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/items/1",
+            "rawQueryString": "",
+            "cookies": [],
+            "headers": {},
+            "queryStringParameters": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/items/1",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"connection": "connection", "in_use": True}
+    assert log == ["acquire connection", "handle 1", "release connection"]
+    assert pool == ["connection"]
+
+
+def test_teardown_after_error() -> None:
+    log.clear()
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/items/missing",
+            "rawQueryString": "",
+            "cookies": [],
+            "headers": {},
+            "queryStringParameters": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/items/missing",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 404
+    assert log == ["acquire connection", "handle missing", "release connection"]
+    assert pool == ["connection"]
+
+
+def test_teardown_does_not_swallow_errors() -> None:
+    log.clear()
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/orders/1",
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": {},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "GET",
+                "path": "/orders/1",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+    response = order_handler(event, object())
+    assert response["statusCode"] == 404
+    assert log == ["begin", "rollback"]
+
+    stream = LocalResponseStream()
+    order_handler.stream(event, stream)
+    assert stream.closed
+    assert stream.prelude["statusCode"] == 404
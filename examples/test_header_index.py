@@ -0,0 +1,110 @@
+import json
+from datetime import datetime
+from typing import Annotated
+
+from easylambda import get
+from easylambda.header import Header
+
+
+@get("/")
+def lambda_handler(
+    request_id: Annotated[str, Header("X-Request-Id")],
+    retries: Annotated[int, Header("X-Retries")],
+    since: Annotated[datetime, Header("If-Modified-Since")],
+    ids: Annotated[list[int], Header("X-Ids", is_list=True)],
+    forwarded: Annotated[str, Header("X-Forwarded-For")],
+    missing: Annotated[list[str], Header("X-Missing", is_list=True)],
+) -> dict:
+    return {
+        "request_id": request_id,
+        "retries": retries,
+        "since": since.isoformat(),
+        "ids": ids,
+        "forwarded": forwarded,
+        "missing": missing,
+    }
+
+
+EXPECTED = {
+    "request_id": "abc",
+    "retries": 3,
+    "since": "2024-01-31T10:00:00+00:00",
+    "ids": [1, 2, 3],
+    "forwarded": "10.0.0.1,10.0.0.2",
+    "missing": [],
+}
+
+
+def test_headers_of_http_api_event() -> None:
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/",
+            "rawQueryString": "",
+            "cookies": [],
+            "headers": {
+                "X-Request-Id": "abc",
+                "x-retries": "3",
+                "if-modified-since": "2024-01-31T10:00:00Z",
+                "x-ids": "1, 2,3",
+                "x-forwarded-for": "10.0.0.1,10.0.0.2",
+            },
+            "queryStringParameters": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        None,
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == EXPECTED
+
+
+def test_multi_value_headers_of_rest_api_event() -> None:
+    response = lambda_handler(
+        {
+            "resource": "/",
+            "path": "/",
+            "httpMethod": "GET",
+            "headers": {"X-Ids": "3"},
+            "multiValueHeaders": {
+                "X-Request-Id": ["abc"],
+                "X-Retries": ["3"],
+                "If-Modified-Since": ["2024-01-31T10:00:00Z"],
+                "X-Ids": ["1", "2, 3"],
+                "X-Forwarded-For": ["10.0.0.1", "10.0.0.2"],
+            },
+            "queryStringParameters": None,
+            "multiValueQueryStringParameters": None,
+            "pathParameters": None,
+            "stageVariables": None,
+            "requestContext": {"requestId": "id", "stage": "prod"},
+            "body": None,
+            "isBase64Encoded": False,
+        },
+        None,
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == EXPECTED
@@ -0,0 +1,102 @@
+import json
+from typing import Annotated
+
+from easylambda import get
+from easylambda.aws import Event
+from easylambda.depends import Depends
+
+
+def get_subject(event: Event) -> str | None:
+    authorizer = event.requestContext.authorizer
+    if authorizer is None:
+        return None
+    return authorizer.jwt.claims["sub"]
+
+
+@get("/")
+def lambda_handler(event: Event) -> dict:
+    return {"path": event.requestContext.http.path}
+
+
+@get("/me")
+def me_handler(subject: Annotated[str | None, Depends(get_subject)]) -> dict:
+    return {"subject": subject}
+
+
+def test_untouched_fields_are_not_validated() -> None:
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/",
+            "rawQueryString": "",
+            "headers": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": {"clientCert": "not a certificate"},
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "isBase64Encoded": False,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"path": "/"}
+
+
+def test_touched_fields_are_validated() -> None:
+    response = me_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/me",
+            "rawQueryString": "",
+            "headers": {},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": {
+                    "jwt": {
+                        "claims": {"sub": "user"},
+                        "scopes": [],
+                    },
+                },
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/me",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "isBase64Encoded": False,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"subject": "user"}
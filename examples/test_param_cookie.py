@@ -0,0 +1,140 @@
+import json
+from datetime import datetime, timezone
+from typing import Annotated
+
+import pytest
+
+from easylambda import Router
+from easylambda.aws import Response
+from easylambda.cookie import Cookie
+
+lambda_handler = Router()
+
+
+@lambda_handler.get("/me")
+def me(
+    session: Annotated[str, Cookie("session")],
+    theme: Annotated[str, Cookie("theme")] = "light",
+) -> dict:
+    return {"session": session, "theme": theme}
+
+
+@lambda_handler.post("/login")
+def login() -> Response:
+    response = Response(statusCode=204)
+    response.set_cookie("session", "abc123", max_age=3600)
+    response.set_cookie(
+        "tracking",
+        "off",
+        expires=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        httponly=False,
+        samesite=None,
+    )
+    return response
+
+
+SET_COOKIES = [
+    "session=abc123; Max-Age=3600; Path=/; Secure; HttpOnly; SameSite=Lax",
+    "tracking=off; Expires=Tue, 01 Jan 2030 00:00:00 GMT; Path=/; Secure",
+]
+
+
+def make_event(method: str, path: str, cookies: list[str] | None) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "cookies": cookies,
+        "headers": {},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+
+def make_rest_event(method: str, path: str, cookie: str | None) -> dict:
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Cookie": cookie} if cookie is not None else {},
+        "multiValueHeaders": {"Cookie": [cookie]} if cookie is not None else {},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {"requestId": "id", "stage": "prod"},
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def test_cookies() -> None:
+    response = lambda_handler(make_event("GET", "/me", ["session=abc123", 'theme="dark"']), None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"session": "abc123", "theme": "dark"}
+
+
+def test_missing_cookie_with_default() -> None:
+    response = lambda_handler(make_event("GET", "/me", ["session=abc123"]), None)
+    assert json.loads(response["body"]) == {"session": "abc123", "theme": "light"}
+
+
+def test_cookie_header_of_rest_api_event() -> None:
+    response = lambda_handler(make_rest_event("GET", "/me", "session=abc123; theme=dark"), None)
+    assert json.loads(response["body"]) == {"session": "abc123", "theme": "dark"}
+
+
+def test_set_cookies() -> None:
+    response = lambda_handler(make_event("POST", "/login", None), None)
+    assert response["statusCode"] == 204
+    assert response["cookies"] == SET_COOKIES
+
+
+def test_set_cookies_of_rest_api_event() -> None:
+    response = lambda_handler(make_rest_event("POST", "/login", None), None)
+    assert "cookies" not in response
+    assert response["multiValueHeaders"] == {"Set-Cookie": SET_COOKIES}
+
+
+def test_set_cookie_rejects_injected_attributes() -> None:
+    response = Response(statusCode=204)
+    for name, value in [
+        ("session", "x; Domain=evil.com"),
+        ("session", "a b"),
+        ("session", "a,b"),
+        ("session", "a\r\nSet-Cookie: b=c"),
+        ("session id", "x"),
+        ("session=", "x"),
+    ]:
+        with pytest.raises(ValueError):
+            response.set_cookie(name, value)
+
+    with pytest.raises(ValueError):
+        response.set_cookie("session", "x", path="/; Domain=evil.com")
+
+    response.set_cookie("session", '"quoted"')
+    assert response.cookies == ['session="quoted"; Path=/; Secure; HttpOnly; SameSite=Lax']
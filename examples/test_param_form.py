@@ -0,0 +1,133 @@
+import json
+from base64 import b64encode
+from typing import Annotated
+
+from pydantic import BaseModel
+
+from easylambda import post
+from easylambda.form import File, Form, UploadFile
+
+
+class Signup(BaseModel):
+    name: str
+    age: int
+
+
+@post("/signup")
+def signup_handler(signup: Annotated[Signup, Form]) -> dict:
+    return signup.model_dump()
+
+
+@post("/upload")
+def upload_handler(
+    title: Annotated[str, Form("title")],
+    tags: Annotated[list[str], Form("tag", is_list=True)],
+    image: Annotated[UploadFile, File("image")],
+) -> dict:
+    return {
+        "title": title,
+        "tags": tags,
+        "filename": image.filename,
+        "content_type": image.content_type,
+        "size": image.size,
+        "shares_body": isinstance(image.data, memoryview),
+        "content": image.read().hex(),
+    }
+
+
+def make_event(path: str, content_type: str, body: bytes) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": {"content-type": content_type},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "POST",
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": b64encode(body).decode(),
+        "pathParameters": None,
+        "isBase64Encoded": True,
+        "stageVariables": None,
+    }
+
+
+MULTIPART = (
+    b"--xyz\r\n"
+    b'Content-Disposition: form-data; name="title"\r\n'
+    b"\r\n"
+    b"Holidays\r\n"
+    b"--xyz\r\n"
+    b'Content-Disposition: form-data; name="tag"\r\n'
+    b"\r\n"
+    b"beach\r\n"
+    b"--xyz\r\n"
+    b'Content-Disposition: form-data; name="tag"\r\n'
+    b"\r\n"
+    b"sun\r\n"
+    b"--xyz\r\n"
+    b'Content-Disposition: form-data; name="image"; filename="photo.png"\r\n'
+    b"Content-Type: image/png\r\n"
+    b"\r\n"
+    b"\x89PNG\r\n\x00\xff\r\n"
+    b"--xyz--\r\n"
+)
+
+
+def test_urlencoded_form() -> None:
+    response = signup_handler(
+        make_event("/signup", "application/x-www-form-urlencoded", b"name=Ana+Lima&age=30"),
+        None,
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"name": "Ana Lima", "age": 30}
+
+
+def test_invalid_form() -> None:
+    response = signup_handler(
+        make_event("/signup", "application/x-www-form-urlencoded", b"name=Ana&age=old"),
+        None,
+    )
+    assert response["statusCode"] == 422
+
+
+def test_multipart_form() -> None:
+    response = upload_handler(
+        make_event("/upload", 'multipart/form-data; boundary="xyz"', MULTIPART), None
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "title": "Holidays",
+        "tags": ["beach", "sun"],
+        "filename": "photo.png",
+        "content_type": "image/png",
+        "size": 8,
+        "shares_body": True,
+        "content": "89504e470d0a00ff",
+    }
+
+
+def test_truncated_multipart_form() -> None:
+    response = upload_handler(
+        make_event("/upload", "multipart/form-data; boundary=xyz", MULTIPART[:-30]), None
+    )
+    assert response["statusCode"] == 400
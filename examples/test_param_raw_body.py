@@ -0,0 +1,111 @@
+import json
+from base64 import b64decode, b64encode
+from hashlib import sha256
+from typing import Annotated
+
+import pytest
+
+from easylambda import body, post
+from easylambda.body import Body, RawBody
+
+IMAGE = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+@post("/upload")
+def lambda_handler(
+    data: Annotated[bytes, RawBody],
+    view: Annotated[memoryview, RawBody(view=True)],
+    parsed: Annotated[bytes | str | dict, Body],
+) -> dict:
+    return {
+        "size": len(data),
+        "sha256": sha256(data).hexdigest(),
+        "header": bytes(view[:4]).hex(),
+        "view_of_data": view.obj is data,
+        "parsed": parsed if isinstance(parsed, (str, dict)) else parsed.hex()[:8],
+    }
+
+
+@post("/upload")
+def optional_handler(
+    data: Annotated[bytes, RawBody],
+    item: Annotated[dict | None, Body] = None,
+) -> dict:
+    return {"size": len(data), "item": item}
+
+
+def make_event(data: bytes, content_type: str, base64: bool = True) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/upload",
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": {"content-type": content_type},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "POST",
+                "path": "/upload",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": b64encode(data).decode() if base64 else data.decode(),
+        "pathParameters": None,
+        "isBase64Encoded": base64,
+        "stageVariables": None,
+    }
+
+
+def test_binary_body_is_decoded_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    monkeypatch.setattr(body, "b64decode", lambda data: calls.append(data) or b64decode(data))
+
+    response = lambda_handler(make_event(IMAGE, "image/png"), None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "size": len(IMAGE),
+        "sha256": sha256(IMAGE).hexdigest(),
+        "header": "89504e47",
+        "view_of_data": True,
+        "parsed": "89504e47",
+    }
+    assert len(calls) == 1
+
+
+def test_text_and_json_bodies() -> None:
+    response = lambda_handler(make_event(b"hello", "text/plain; charset=utf-8"), None)
+    assert json.loads(response["body"])["parsed"] == "hello"
+
+    response = lambda_handler(
+        make_event(b'{"a": 1}', "application/json; charset=utf-8", base64=False), None
+    )
+    assert json.loads(response["body"])["parsed"] == {"a": 1}
+
+
+def test_invalid_text_body() -> None:
+    response = lambda_handler(make_event(b"\xff\xfe", "text/plain"), None)
+    assert response["statusCode"] == 400
+
+
+def test_missing_body() -> None:
+    event = make_event(b"", "application/json")
+    event["body"] = None
+    del event["headers"]["content-type"]
+
+    response = optional_handler(event, None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"size": 0, "item": None}
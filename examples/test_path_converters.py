@@ -0,0 +1,113 @@
+import json
+from typing import Annotated, Any
+
+from easylambda import Router, get
+from easylambda.path import Path
+
+
+@get("/items/{item_id:int}")
+def item_handler(item_id: Annotated[Any, Path("item_id")]) -> dict:
+    return {"item_id": item_id, "type": type(item_id).__name__}
+
+
+router = Router()
+
+
+@router.get("/items/{item_id:int}")
+def get_item(item_id: Annotated[int, Path("item_id")]) -> dict:
+    return {"item_id": item_id}
+
+
+@router.get("/items/{slug}")
+def get_item_by_slug(slug: Annotated[str, Path("slug")]) -> dict:
+    return {"slug": slug}
+
+
+@router.get("/orders/{order_id:uuid}")
+def get_order(order_id: Annotated[Any, Path("order_id")]) -> dict:
+    return {"order_id": str(order_id), "type": type(order_id).__name__}
+
+
+@router.get("/files/{name:path}")
+def get_file(name: Annotated[str, Path("name")]) -> dict:
+    return {"name": name}
+
+
+def make_event(path: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": {},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "GET",
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+
+@get("/static/.*")
+def catch_all_handler() -> dict:
+    return {"route": "static"}
+
+
+def test_int_converter() -> None:
+    response = item_handler(make_event("/items/42"), None)
+    assert json.loads(response["body"]) == {"item_id": 42, "type": "int"}
+
+
+def test_mismatch_is_rejected_at_routing() -> None:
+    assert item_handler(make_event("/items/abc"), None)["statusCode"] == 404
+    assert item_handler(make_event("/items/-1"), None)["statusCode"] == 404
+    assert item_handler(make_event("/items/" + "9" * 5000), None)["statusCode"] == 404
+
+
+def test_typed_parameters_take_precedence() -> None:
+    response = router(make_event("/items/42"), None)
+    assert json.loads(response["body"]) == {"item_id": 42}
+
+    response = router(make_event("/items/blue-pen"), None)
+    assert json.loads(response["body"]) == {"slug": "blue-pen"}
+
+
+def test_uuid_converter() -> None:
+    order_id = "6f1c2a5e-0b7d-4c1e-9a51-2b8f3c4d5e6f"
+    response = router(make_event(f"/orders/{order_id}"), None)
+    assert json.loads(response["body"]) == {"order_id": order_id, "type": "UUID"}
+
+    assert router(make_event("/orders/42"), None)["statusCode"] == 404
+
+
+def test_path_converter() -> None:
+    response = router(make_event("/files/docs/2024/report.pdf"), None)
+    assert json.loads(response["body"]) == {"name": "docs/2024/report.pdf"}
+
+    assert router(make_event("/files/"), None)["statusCode"] == 404
+
+
+def test_static_text_is_a_regular_expression() -> None:
+    response = catch_all_handler(make_event("/static/css/site.css"), None)
+    assert json.loads(response["body"]) == {"route": "static"}
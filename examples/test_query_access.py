@@ -0,0 +1,145 @@
+import json
+from typing import Annotated
+
+from pydantic import BaseModel
+
+from easylambda import get
+from easylambda.aws import Event
+from easylambda.query import Query
+
+
+class Filter(BaseModel):
+    status: str
+    owner: str | None = None
+
+
+@get("/search")
+def lambda_handler(
+    q: Annotated[str, Query("q")],
+    page: Annotated[int, Query("page")] = 1,
+    ids: Annotated[list[int], Query("id", is_list=True)] = [],
+    tags: Annotated[list[str], Query("tag", is_list=True)] = [],
+    filter: Annotated[Filter | None, Query("filter")] = None,
+) -> dict:
+    return {
+        "q": q,
+        "page": page,
+        "ids": ids,
+        "tags": tags,
+        "filter": None if filter is None else filter.model_dump(),
+    }
+
+
+def make_event(raw_query_string: str, query_string_parameters: dict | None) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/search",
+        "rawQueryString": raw_query_string,
+        "cookies": [],
+        "headers": {},
+        "queryStringParameters": query_string_parameters,
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "GET",
+                "path": "/search",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+
+def test_single_values_skip_parsing() -> None:
+    event = Event.model_validate(make_event("q=lambda&page=2", {"q": "lambda", "page": "2"}))
+
+    assert event.get_query("q") == "lambda"
+    assert event.get_query("page") == "2"
+    assert "_parsed_qs" not in event.__dict__
+    assert event.get_query("missing") is None
+
+
+def test_repeated_values() -> None:
+    response = lambda_handler(
+        make_event("q=a&q=b&id=1&id=2", {"q": "a,b", "id": "1,2"}),
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "q": "b",
+        "page": 1,
+        "ids": [1, 2],
+        "tags": [],
+        "filter": None,
+    }
+
+
+def test_values_with_commas() -> None:
+    response = lambda_handler(make_event("q=a%2Cb", {"q": "a,b"}), object())
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["q"] == "a,b"
+
+
+def test_plus_is_a_space() -> None:
+    response = lambda_handler(make_event("q=a+b", {"q": "a+b"}), object())
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["q"] == "a b"
+
+    response = lambda_handler(make_event("q=a%2Bb", {"q": "a+b"}), object())
+
+    assert json.loads(response["body"])["q"] == "a+b"
+
+
+def test_bracket_notation() -> None:
+    response = lambda_handler(
+        make_event(
+            "q=x&filter[status]=open&filter[owner]=me&tag[]=a&tag[]=b",
+            {"q": "x", "filter[status]": "open", "filter[owner]": "me", "tag[]": "a,b"},
+        ),
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "q": "x",
+        "page": 1,
+        "ids": [],
+        "tags": ["a", "b"],
+        "filter": {"status": "open", "owner": "me"},
+    }
+
+
+def test_nested_bracket_notation() -> None:
+    event = Event.model_validate(
+        make_event(
+            "a%5Bb%5D%5Bc%5D=1&a%5Bd%5D%5B%5D=2&a%5Bd%5D%5B%5D=3",
+            {"a[b][c]": "1", "a[d][]": "2,3"},
+        )
+    )
+
+    assert event.get_query("a") == {"b": {"c": "1"}, "d": ["2", "3"]}
+
+
+def test_missing_required() -> None:
+    response = lambda_handler(make_event("", None), object())
+
+    assert response["statusCode"] == 422
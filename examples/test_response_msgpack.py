@@ -0,0 +1,97 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import date
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel
+
+from easylambda import post
+from easylambda.body import Body
+from easylambda.encoders import negotiate
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class Order(BaseModel):
+    order_id: int
+    items: list[str]
+    due: date
+
+
+@post("/orders")
+def lambda_handler(order: Annotated[Order, Body]) -> Order:
+    return order
+
+
+def make_event(content_type: str, body: bytes, accept: str | None) -> dict:
+    headers = {"content-type": content_type}
+    if accept is not None:
+        headers["accept"] = accept
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/orders",
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": headers,
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "POST",
+                "path": "/orders",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": b64encode(body).decode(),
+        "pathParameters": None,
+        "isBase64Encoded": True,
+        "stageVariables": None,
+    }
+
+
+ORDER = {"order_id": 1, "items": ["book", "pen"], "due": "2024-01-31"}
+
+
+def test_msgpack_request_and_response() -> None:
+    response = lambda_handler(
+        make_event("application/msgpack", msgpack.packb(ORDER), "application/msgpack"), None
+    )
+    assert response["statusCode"] == 200
+    assert response["headers"] == {"Content-Type": "application/msgpack"}
+    assert response["isBase64Encoded"] is True
+    assert msgpack.unpackb(b64decode(response["body"])) == ORDER
+
+
+def test_json_is_the_fallback() -> None:
+    for accept in (None, "*/*", "text/html", "application/json, application/msgpack;q=0.5"):
+        response = lambda_handler(
+            make_event("application/msgpack", msgpack.packb(ORDER), accept), None
+        )
+        assert response["headers"] == {"Content-Type": "application/json"}
+        assert json.loads(response["body"]) == ORDER
+
+
+def test_invalid_msgpack_body() -> None:
+    response = lambda_handler(make_event("application/msgpack", b"\xc1", None), None)
+    assert response["statusCode"] == 422
+
+
+def test_negotiate() -> None:
+    assert negotiate("application/x-msgpack").media_type == "application/x-msgpack"
+    assert negotiate("application/msgpack;q=0.9, application/json;q=0.8").binary
+    assert negotiate("application/msgpack;q=0").media_type == "application/json"
+    assert negotiate("application/*").media_type == "application/json"
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from threading import current_thread
+from time import monotonic, sleep
+from typing import Annotated, Iterator
+
+from pydantic import BaseModel
+
+from easylambda import sqs
+from easylambda.aws import SqsRecord
+from easylambda.depends import Depends
+from easylambda.sqs import Message, MessageAttribute
+
+processed = []
+log = []
+
+
+class Order(BaseModel):
+    order_id: int
+    amount: float
+
+
+def get_session() -> Iterator[str]:
+    log.append("open")
+    try:
+        yield "session"
+    finally:
+        log.append("close")
+
+
+@sqs
+def lambda_handler(
+    order: Annotated[Order, Message],
+    tenant: Annotated[str, MessageAttribute("tenant")],
+    session: Annotated[str, Depends(get_session)],
+) -> None:
+    if order.amount < 0:
+        raise ValueError("Negative amount.")
+    processed.append((order.order_id, tenant, session))
+
+
+@sqs(parallel=True)
+def parallel_handler(record: SqsRecord, order: Annotated[Order, Message]) -> None:
+    processed.append((order.order_id, record.messageId, current_thread().name))
+
+
+def slow_lookup() -> str:
+    sleep(0.1)
+    return "customer"
+
+
+@sqs(parallel=True)
+def slow_handler(customer: Annotated[str, Depends(slow_lookup)]) -> None:
+    processed.append(customer)
+
+
+@sqs
+async def async_handler(order: Annotated[Order, Message]) -> None:
+    await asyncio.sleep(0.01 * (3 - order.order_id))
+    if order.order_id == 2:
+        raise ValueError("Unlucky order.")
+    processed.append(order.order_id)
+
+
+def make_record(index: int, body: str, queue: str = "orders") -> dict:
+    return {
+        "messageId": f"message-{index}",
+        "receiptHandle": "handle",
+        "body": body,
+        "attributes": {
+            "ApproximateReceiveCount": "1",
+            "SentTimestamp": "1545082649183",
+            "SenderId": "AIDAIENQZJOLO23YVJ4VO",
+            "ApproximateFirstReceiveTimestamp": "1545082649185",
+        },
+        "messageAttributes": {
+            "tenant": {"stringValue": "acme", "dataType": "String", "stringListValues": []}
+        },
+        "md5OfBody": "e4e68fb7bd0e697a0ae8f1bb342846b3",
+        "eventSource": "aws:sqs",
+        "eventSourceARN": f"arn:aws:sqs:us-east-2:123456789012:{queue}",
+        "awsRegion": "us-east-2",
+    }
+
+
+def make_event(amounts: list[float], queue: str = "orders") -> dict:
+    return {
+        "Records": [
+            make_record(i, json.dumps({"order_id": i, "amount": amount}), queue)
+            for i, amount in enumerate(amounts)
+        ]
+    }
+
+
+def test_only_failed_messages_are_reported() -> None:
+    processed.clear()
+    log.clear()
+    event = make_event([10, -1, 5])
+    event["Records"].append(make_record(3, "not json"))
+
+    response = lambda_handler(event, None)
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "message-1"}, {"itemIdentifier": "message-3"}]
+    }
+    assert processed == [(0, "acme", "session"), (2, "acme", "session")]
+    assert log == ["open", "close"] * 4
+
+
+def test_fifo_messages_after_a_failure_are_retried() -> None:
+    processed.clear()
+    response = lambda_handler(make_event([10, -1, 5], "orders.fifo"), None)
+    assert response == {
+        "batchItemFailures": [{"itemIdentifier": "message-1"}, {"itemIdentifier": "message-2"}]
+    }
+    assert processed == [(0, "acme", "session")]
+
+
+def test_parallel_messages() -> None:
+    processed.clear()
+    response = parallel_handler(make_event([1, 2, 3, 4]), None)
+    assert response == {"batchItemFailures": []}
+    assert sorted(order_id for order_id, _, _ in processed) == [0, 1, 2, 3]
+    assert all(message_id == f"message-{i}" for i, message_id, _ in processed)
+    assert all(thread.startswith("easylambda") for _, _, thread in processed)
+
+
+def test_parallel_messages_do_not_share_dependency_locks() -> None:
+    processed.clear()
+    start = monotonic()
+    response = slow_handler(make_event([1, 2, 3, 4, 5]), None)
+    assert response == {"batchItemFailures": []}
+    assert processed == ["customer"] * 5
+    assert monotonic() - start < 0.3
+
+
+def test_async_messages_run_concurrently() -> None:
+    processed.clear()
+    response = async_handler(make_event([1, 2, 3]), None)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "message-2"}]}
+    assert processed == [1, 0]
@@ -0,0 +1,237 @@
+import json
+from base64 import b64decode
+from typing import Annotated, AsyncIterator, Iterator
+
+import pytest
+
+from easylambda import get, streaming
+from easylambda.depends import Depends
+from easylambda.path import Path
+from easylambda.streaming import (
+    LocalResponseStream,
+    RuntimeResponseStream,
+    StreamingResponse,
+)
+
+log = []
+
+
+def get_connection() -> Iterator[str]:
+    log.append("open")
+    yield "connection"
+    log.append("close")
+
+
+@get("/rows/{count}")
+def lambda_handler(
+    count: Annotated[int, Path("count")],
+    connection: Annotated[str, Depends(get_connection)],
+) -> Iterator[str]:
+    for i in range(count):
+        log.append(f"row {i}")
+        yield f"{connection} row {i}\n"
+
+
+@get("/report")
+def report_handler() -> StreamingResponse:
+    return StreamingResponse(
+        iter([b"\x89PNG", b"\x00\xff"]),
+        headers={"Content-Type": "image/png"},
+    )
+
+
+@get("/broken")
+def broken_handler(connection: Annotated[str, Depends(get_connection)]) -> Iterator[str]:
+    yield "first row\n"
+    raise RuntimeError("Lost the connection.")
+
+
+async def get_async_connection() -> str:
+    return "async connection"
+
+
+@get("/events/{count}")
+async def async_handler(
+    count: Annotated[int, Path("count")],
+    connection: Annotated[str, Depends(get_async_connection)],
+) -> AsyncIterator[str]:
+    for i in range(count):
+        yield f"{connection} event {i}\n"
+
+
+class RecordingStream(LocalResponseStream):
+    __slots__ = ()
+
+    def write(self, data: bytes) -> None:
+        super().write(data)
+        log.append("write")
+
+
+def make_event(path: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "cookies": [],
+        "headers": {},
+        "queryStringParameters": {},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "<urlid>",
+            "authentication": None,
+            "authorizer": None,
+            "domainName": "url-id.lambda-url.us-west-2.on.aws",
+            "domainPrefix": "url-id",
+            "http": {
+                "method": "GET",
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "123.123.123.123",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": "",
+        "pathParameters": None,
+        "isBase64Encoded": False,
+        "stageVariables": None,
+    }
+
+
+def test_chunks_are_written_as_they_are_produced() -> None:
+    log.clear()
+    stream = RecordingStream()
+    lambda_handler.stream(make_event("/rows/3"), stream)
+
+    assert stream.closed
+    assert stream.prelude == {"statusCode": 200, "headers": {"Content-Type": "text/plain"}}
+    assert stream.body == b"connection row 0\nconnection row 1\nconnection row 2\n"
+    assert log == [
+        "open",
+        "write",
+        "row 0",
+        "write",
+        "row 1",
+        "write",
+        "row 2",
+        "write",
+        "close",
+    ]
+
+
+def test_streamed_response_is_buffered_without_a_stream() -> None:
+    log.clear()
+    response = lambda_handler(make_event("/rows/2"), object())
+    assert response == {
+        "statusCode": 200,
+        "headers": {"Content-Type": "text/plain"},
+        "isBase64Encoded": False,
+        "multiValueHeaders": {},
+        "body": "connection row 0\nconnection row 1\n",
+    }
+    assert log == ["open", "row 0", "row 1", "close"]
+
+
+def test_binary_streaming_response() -> None:
+    stream = LocalResponseStream()
+    report_handler.stream(make_event("/report"), stream)
+    assert stream.prelude == {"statusCode": 200, "headers": {"Content-Type": "image/png"}}
+    assert stream.body == b"\x89PNG\x00\xff"
+
+    response = report_handler(make_event("/report"), object())
+    assert response["isBase64Encoded"] is True
+    assert response["body"] == "iVBORwD/"
+
+
+def test_errors_are_streamed_as_buffered_responses() -> None:
+    stream = LocalResponseStream()
+    lambda_handler.stream(make_event("/missing"), stream)
+    assert stream.closed
+    assert stream.prelude["statusCode"] == 404
+
+
+def test_errors_while_streaming_fail_the_stream() -> None:
+    stream = LocalResponseStream()
+    with pytest.raises(RuntimeError):
+        broken_handler.stream(make_event("/broken"), stream)
+
+    assert stream.closed
+    assert isinstance(stream.error, RuntimeError)
+    assert stream.prelude["statusCode"] == 200
+    assert stream.body == b"first row\n"
+
+
+class StopServing(BaseException):
+    pass
+
+
+class FakeConnection:
+    def __init__(self, events: list[dict]) -> None:
+        self.events = events
+        self.sent = []
+
+    def request(self, method: str, url: str) -> None:
+        if not self.events:
+            raise StopServing()
+
+    def getresponse(self) -> "FakeConnection":
+        return self
+
+    def getheader(self, name: str) -> str:
+        return "request-id"
+
+    def read(self) -> bytes:
+        return json.dumps(self.events.pop(0)).encode() if self.events else b""
+
+    def send(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    def close(self) -> None:
+        pass
+
+
+def test_serve_keeps_running_after_a_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    connection = FakeConnection([make_event("/broken"), make_event("/missing")])
+    streams = []
+    monkeypatch.setenv("AWS_LAMBDA_RUNTIME_API", "localhost:9001")
+    monkeypatch.setattr(streaming, "HTTPConnection", lambda host: connection)
+    monkeypatch.setattr(
+        streaming,
+        "RuntimeResponseStream",
+        lambda request_id, runtime_api: streams.append(LocalResponseStream()) or streams[-1],
+    )
+
+    with pytest.raises(StopServing):
+        streaming.serve(broken_handler)
+
+    assert isinstance(streams[0].error, RuntimeError)
+    assert streams[1].error is None
+    assert streams[1].prelude["statusCode"] == 404
+
+
+def test_runtime_stream_reports_errors_in_trailers() -> None:
+    stream = RuntimeResponseStream.__new__(RuntimeResponseStream)
+    stream.connection = FakeConnection([])
+    stream.fail(RuntimeError("Lost the connection."))
+
+    terminator = stream.connection.sent[-1].decode()
+    assert terminator.startswith("0\r\nLambda-Runtime-Function-Error-Type: RuntimeError\r\n")
+    assert terminator.endswith("\r\n\r\n")
+    body = terminator.split("Lambda-Runtime-Function-Error-Body: ")[1].strip()
+    assert json.loads(b64decode(body))["errorMessage"] == "Lost the connection."
+
+
+def test_async_generator_handler() -> None:
+    stream = LocalResponseStream()
+    async_handler.stream(make_event("/events/2"), stream)
+    assert stream.prelude == {"statusCode": 200, "headers": {"Content-Type": "text/plain"}}
+    assert stream.body == b"async connection event 0\nasync connection event 1\n"
+
+    response = async_handler(make_event("/events/1"), object())
+    assert response["statusCode"] == 200
+    assert response["body"] == "async connection event 0\n"
@@ -0,0 +1,220 @@
+import json
+from base64 import b64encode
+from decimal import Decimal
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel
+
+from easylambda import dynamodb, kinesis
+from easylambda.aws import KinesisRecord
+from easylambda.streams import (
+    Keys,
+    NewImage,
+    OldImage,
+    Payload,
+    StreamHandler,
+    decode_payloads,
+    unmarshal,
+)
+
+calls = []
+
+
+class Reading(BaseModel):
+    sensor: str
+    value: float
+
+
+@kinesis
+def record_handler(record: KinesisRecord, reading: Annotated[Reading, Payload]) -> None:
+    if reading.value < 0:
+        raise ValueError("Negative reading.")
+    calls.append((record.kinesis.partitionKey, reading.sensor))
+
+
+@kinesis(batch=True)
+def batch_handler(readings: Annotated[list[Reading], Payload]) -> None:
+    calls.append([reading.sensor for reading in readings])
+    if any(reading.value < 0 for reading in readings):
+        raise ValueError("Negative reading.")
+
+
+@kinesis(batch=True, bisect=False)
+def unbisected_handler(readings: Annotated[list[Reading], Payload]) -> None:
+    calls.append(len(readings))
+    raise ValueError("Always fails.")
+
+
+class User(BaseModel):
+    id: str
+    name: str
+    age: int
+
+
+@dynamodb
+def user_handler(
+    keys: Annotated[dict, Keys],
+    new: Annotated[User | None, NewImage] = None,
+    old: Annotated[User | None, OldImage] = None,
+) -> None:
+    calls.append((keys["id"], old and old.name, new and new.name))
+
+
+@dynamodb(batch=True)
+def users_handler(new: Annotated[list[User | None], NewImage]) -> None:
+    calls.append([user and user.age for user in new])
+
+
+def make_kinesis_event(payloads: list[bytes]) -> dict:
+    return {
+        "Records": [
+            {
+                "kinesis": {
+                    "kinesisSchemaVersion": "1.0",
+                    "partitionKey": f"key-{i}",
+                    "sequenceNumber": f"4959033{i:04}",
+                    "data": b64encode(payload).decode(),
+                    "approximateArrivalTimestamp": 1545084650.987,
+                },
+                "eventSource": "aws:kinesis",
+                "eventVersion": "1.0",
+                "eventID": f"shardId-000000000006:4959033{i:04}",
+                "eventName": "aws:kinesis:record",
+                "invokeIdentityArn": "arn:aws:iam::123456789012:role/lambda-role",
+                "awsRegion": "us-east-2",
+                "eventSourceARN": "arn:aws:kinesis:us-east-2:123456789012:stream/readings",
+            }
+            for i, payload in enumerate(payloads)
+        ]
+    }
+
+
+def readings(*values: float) -> list[bytes]:
+    return [json.dumps({"sensor": f"s{i}", "value": v}).encode() for i, v in enumerate(values)]
+
+
+def user_image(user_id: str, name: str, age: int) -> dict:
+    return {"id": {"S": user_id}, "name": {"S": name}, "age": {"N": str(age)}}
+
+
+def make_dynamodb_record(index: int, event_name: str, new: dict | None, old: dict | None) -> dict:
+    image = new or old
+    record = {
+        "Keys": {"id": image["id"]},
+        "SequenceNumber": f"{index}00",
+        "SizeBytes": 26,
+        "StreamViewType": "NEW_AND_OLD_IMAGES",
+    }
+    if new is not None:
+        record["NewImage"] = new
+    if old is not None:
+        record["OldImage"] = old
+    return {
+        "eventID": str(index),
+        "eventName": event_name,
+        "eventVersion": "1.0",
+        "eventSource": "aws:dynamodb",
+        "awsRegion": "us-east-2",
+        "dynamodb": record,
+        "eventSourceARN": "arn:aws:dynamodb:us-east-2:123456789012:table/users/stream/x",
+    }
+
+
+def test_kinesis_records_stop_at_the_first_failure() -> None:
+    calls.clear()
+    response = record_handler(make_kinesis_event(readings(1, 2, -3, 4)), None)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "49590330002"}]}
+    assert calls == [("key-0", "s0"), ("key-1", "s1")]
+
+
+def test_kinesis_payloads_that_are_not_json() -> None:
+    calls.clear()
+    response = record_handler(make_kinesis_event([b"\x00\x01", *readings(1)]), None)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "49590330000"}]}
+    assert calls == []
+
+
+def test_payloads_are_parsed_separately() -> None:
+    data = [b64encode(payload).decode() for payload in (b"1,2", b"[3", b"4]", b'{"a": 1}')]
+    assert decode_payloads(data) == [b"1,2", b"[3", b"4]", {"a": 1}]
+
+
+def test_kinesis_batch() -> None:
+    calls.clear()
+    response = batch_handler(make_kinesis_event(readings(1, 2, 3)), None)
+    assert response == {"batchItemFailures": []}
+    assert calls == [["s0", "s1", "s2"]]
+
+
+def test_kinesis_batch_is_bisected_on_error() -> None:
+    calls.clear()
+    response = batch_handler(make_kinesis_event(readings(1, 2, 3, 4, -5, 6, 7, 8)), None)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "49590330004"}]}
+    assert calls == [
+        ["s0", "s1", "s2", "s3", "s4", "s5", "s6", "s7"],
+        ["s0", "s1", "s2", "s3"],
+        ["s4", "s5", "s6", "s7"],
+        ["s4", "s5"],
+        ["s4"],
+    ]
+
+
+def test_kinesis_batch_without_bisect() -> None:
+    calls.clear()
+    response = unbisected_handler(make_kinesis_event(readings(1, 2, 3)), None)
+    assert response == {"batchItemFailures": [{"itemIdentifier": "49590330000"}]}
+    assert calls == [3]
+
+
+def test_dynamodb_records() -> None:
+    calls.clear()
+    event = {
+        "Records": [
+            make_dynamodb_record(1, "INSERT", user_image("u1", "Ana", 30), None),
+            make_dynamodb_record(
+                2, "MODIFY", user_image("u1", "Bia", 31), user_image("u1", "Ana", 30)
+            ),
+            make_dynamodb_record(3, "REMOVE", None, user_image("u1", "Bia", 31)),
+        ]
+    }
+    assert user_handler(event, None) == {"batchItemFailures": []}
+    assert calls == [("u1", None, "Ana"), ("u1", "Ana", "Bia"), ("u1", "Bia", None)]
+
+    calls.clear()
+    assert users_handler(event, None) == {"batchItemFailures": []}
+    assert calls == [[30, 31, None]]
+
+
+def test_unmarshal() -> None:
+    assert unmarshal(
+        {
+            "s": {"S": "text"},
+            "i": {"N": "42"},
+            "d": {"N": "1.5"},
+            "b": {"B": "AAE="},
+            "t": {"BOOL": True},
+            "n": {"NULL": True},
+            "l": {"L": [{"N": "1"}, {"S": "x"}]},
+            "m": {"M": {"k": {"SS": ["a", "b"]}}},
+            "ns": {"NS": ["1", "2.5"]},
+        }
+    ) == {
+        "s": "text",
+        "i": 42,
+        "d": Decimal("1.5"),
+        "b": b"\x00\x01",
+        "t": True,
+        "n": None,
+        "l": [1, "x"],
+        "m": {"k": {"a", "b"}},
+        "ns": {1, Decimal("2.5")},
+    }
+
+
+def test_stream_handlers_must_define_sequence_numbers() -> None:
+    class IncompleteHandler(StreamHandler):
+        record_model = KinesisRecord
+
+    with pytest.raises(TypeError):
+        IncompleteHandler(lambda: None, batch=False, bisect=False, print_errors=False)
@@ -0,0 +1,161 @@
+import json
+from typing import Annotated
+
+from easylambda import get
+from easylambda.header import Header
+from easylambda.path import Path
+from easylambda.query import Query
+
+
+@get("/items/{item_id}")
+def lambda_handler(
+    item_id: Annotated[int, Path("item_id")],
+    limit: Annotated[int, Query("limit")] = 10,
+    if_match: Annotated[int | None, Header("if-match")] = None,
+) -> dict:
+    return {"item_id": item_id, "limit": limit, "if_match": if_match}
+
+
+@get("/search")
+def search_handler(
+    q: Annotated[str, Query("q")],
+    tenant: Annotated[str, Header("x-tenant")],
+    page: Annotated[int, Query("page")] = 1,
+) -> dict:
+    return {"q": q, "tenant": tenant, "page": page}
+
+
+def test_coercion() -> None:
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/items/1",
+            "rawQueryString": "limit=5",
+            "cookies": [],
+            "headers": {
+                "if-match": "3",
+            },
+            "queryStringParameters": {"limit": "5"},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/items/1",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"item_id": 1, "limit": 5, "if_match": 3}
+
+
+def test_errors_are_aggregated() -> None:
+    response = lambda_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/items/one",
+            "rawQueryString": "limit=five",
+            "cookies": [],
+            "headers": {
+                "if-match": "three",
+            },
+            "queryStringParameters": {"limit": "five"},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/items/one",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 422
+    detail = json.loads(response["body"])["detail"]
+    assert "item_id" in detail
+    assert "limit" in detail
+    assert "if_match" in detail
+
+
+def test_missing_parameters_are_aggregated() -> None:
+    response = search_handler(
+        {
+            "version": "2.0",
+            "routeKey": "$default",
+            "rawPath": "/search",
+            "rawQueryString": "page=two",
+            "cookies": [],
+            "headers": {},
+            "queryStringParameters": {"page": "two"},
+            "requestContext": {
+                "accountId": "123456789012",
+                "apiId": "<urlid>",
+                "authentication": None,
+                "authorizer": None,
+                "domainName": "url-id.lambda-url.us-west-2.on.aws",
+                "domainPrefix": "url-id",
+                "http": {
+                    "method": "GET",
+                    "path": "/search",
+                    "protocol": "HTTP/1.1",
+                    "sourceIp": "123.123.123.123",
+                    "userAgent": "agent",
+                },
+                "requestId": "id",
+                "routeKey": "$default",
+                "stage": "$default",
+                "time": "12/Mar/2020:19:03:58 +0000",
+                "timeEpoch": 1583348638390,
+            },
+            "body": "",
+            "pathParameters": None,
+            "isBase64Encoded": False,
+            "stageVariables": None,
+        },
+        object(),
+    )
+
+    assert response["statusCode"] == 422
+    detail = json.loads(response["body"])["detail"]
+    assert "q\n  Field required" in detail
+    assert "tenant\n  Field required" in detail
+    assert "page" in detail